@@ -23,6 +23,7 @@ from attractor_agent.session import (
     ToolResultsTurn,
     SteeringTurn,
     SystemTurn,
+    compact_history,
     process_input,
 )
 from attractor_agent.subagent import SubAgentManager, SubAgentHandle, SubAgentResult, make_subagent_tools
@@ -19,6 +19,8 @@ class ExecutionEnvironment(Protocol):
 
     async def file_exists(self, path: str) -> bool: ...
 
+    async def remove_file(self, path: str) -> None: ...
+
     async def list_directory(self, path: str, depth: int = 1) -> list[DirEntry]: ...
 
     async def exec_command(
@@ -3,10 +3,15 @@
 from __future__ import annotations
 
 import asyncio
+import fnmatch
 import os
 import platform
+import re
+import shutil
 import signal
 import time
+from itertools import islice
+from operator import itemgetter
 from pathlib import Path
 
 from attractor_agent.types import DirEntry, ExecResult
@@ -20,89 +25,196 @@ _SAFE_ENV_VARS = frozenset({
 
 # Patterns to exclude from environment
 _SECRET_PATTERNS = ("_API_KEY", "_SECRET", "_TOKEN", "_PASSWORD", "_CREDENTIAL")
+_SECRET_RE = re.compile(
+    "|".join(re.escape(pat) for pat in _SECRET_PATTERNS), re.IGNORECASE
+)
 
 
 def _filter_env(extra: dict[str, str] | None = None) -> dict[str, str]:
     """Build a filtered environment dict, excluding secrets."""
-    env: dict[str, str] = {}
-    for key, val in os.environ.items():
-        if key in _SAFE_ENV_VARS:
-            env[key] = val
-        elif not any(pat in key.upper() for pat in _SECRET_PATTERNS):
-            env[key] = val
+    is_secret = _SECRET_RE.search
+    env = {
+        key: val
+        for key, val in os.environ.items()
+        if key in _SAFE_ENV_VARS or not is_secret(key)
+    }
     if extra:
         env.update(extra)
     return env
 
 
+def _read_lines(full: str, offset: int | None, limit: int | None) -> str:
+    """Read a file, optionally restricted to a 1-based line window."""
+    if offset is None and limit is None:
+        return Path(full).read_text()
+    # Out-of-range values come straight from the model; clamp them rather
+    # than let islice reject negative indices
+    start = max(offset or 1, 1) - 1
+    stop = None if limit is None else start + max(limit, 0)
+    # Only the requested window is materialised; lines before it are skipped
+    # and the rest of the file is never read when a limit is given.
+    with open(full) as f:
+        return "".join(islice(f, start, stop))
+
+
+def _write_text(full: str, content: str) -> None:
+    """Write a file, creating parent directories as needed."""
+    Path(full).parent.mkdir(parents=True, exist_ok=True)
+    Path(full).write_text(content)
+
+
+def _sorted_scandir(path: str) -> list[os.DirEntry[str]]:
+    """List a directory sorted by name, treating unreadable ones as empty."""
+    try:
+        with os.scandir(path) as it:
+            return sorted(it, key=lambda de: de.name)
+    except PermissionError:
+        return []
+
+
+def _walk(root: str, max_depth: int) -> list[DirEntry]:
+    """Depth-first listing of ``root`` down to ``max_depth`` levels.
+
+    Uses an explicit stack of scandir iterators instead of recursion; scandir
+    entries carry their file type, so only regular files need a stat call.
+    """
+    entries: list[DirEntry] = []
+    if max_depth <= 0:
+        return entries
+    stack = [iter(_sorted_scandir(root))]
+    while stack:
+        item = next(stack[-1], None)
+        if item is None:
+            stack.pop()
+            continue
+        is_dir = item.is_dir()
+        size = None
+        if not is_dir:
+            try:
+                size = item.stat().st_size
+            except OSError:
+                pass
+        entries.append(DirEntry(name=item.name, is_dir=is_dir, size=size))
+        if is_dir and len(stack) < max_depth:
+            stack.append(iter(_sorted_scandir(item.path)))
+    return entries
+
+
+def _glob(root: str, pattern: str) -> list[str]:
+    """Match ``pattern`` under ``root``, newest first by modification time."""
+    # Each match's mtime is recorded as it is found, so sorting needs no
+    # further path resolution or stat calls.
+    keyed: list[tuple[float, str]] = []
+    if "**" in pattern:
+        base = Path(root)
+        for p in base.rglob(pattern.replace("**/", "")):
+            keyed.append((p.stat().st_mtime, str(p.relative_to(base))))
+    else:
+        match = re.compile(fnmatch.translate(pattern)).match
+        with os.scandir(root) as it:
+            for de in it:
+                if match(de.name):
+                    keyed.append((de.stat().st_mtime, de.name))
+    keyed.sort(key=itemgetter(0), reverse=True)
+    return [m for _, m in keyed]
+
+
+def _signal_group(proc: asyncio.subprocess.Process, sig: int) -> None:
+    """Send a signal to a child's process group, ignoring already-exited ones."""
+    try:
+        os.killpg(os.getpgid(proc.pid), sig)
+    except (ProcessLookupError, OSError):
+        pass
+
+
 class LocalExecutionEnvironment:
     """Execution environment backed by the local filesystem and subprocess."""
 
     def __init__(self, working_dir: str | None = None) -> None:
         self._working_dir = working_dir or os.getcwd()
+        self._base_env: dict[str, str] | None = None
+        self._rg_path = shutil.which("rg")
 
     async def read_file(
         self, path: str, offset: int | None = None, limit: int | None = None
     ) -> str:
         full = self._resolve(path)
-        text = Path(full).read_text()
-        lines = text.splitlines(keepends=True)
-        start = (offset or 1) - 1
-        if limit is not None:
-            lines = lines[start : start + limit]
-        else:
-            lines = lines[start:]
-        return "".join(lines)
+        return await asyncio.to_thread(_read_lines, full, offset, limit)
 
     async def write_file(self, path: str, content: str) -> None:
         full = self._resolve(path)
-        Path(full).parent.mkdir(parents=True, exist_ok=True)
-        Path(full).write_text(content)
+        await asyncio.to_thread(_write_text, full, content)
 
     async def file_exists(self, path: str) -> bool:
         return Path(self._resolve(path)).exists()
 
-    async def list_directory(self, path: str, depth: int = 1) -> list[DirEntry]:
-        full = Path(self._resolve(path))
-        entries: list[DirEntry] = []
-        self._walk(full, entries, depth, 0)
-        return entries
-
-    def _walk(
-        self, root: Path, entries: list[DirEntry], max_depth: int, current: int
-    ) -> None:
-        if current >= max_depth:
-            return
+    async def remove_file(self, path: str) -> None:
+        """Delete a file; a missing file is not an error (like ``rm -f``)."""
         try:
-            for item in sorted(root.iterdir(), key=lambda p: p.name):
-                is_dir = item.is_dir()
-                size = item.stat().st_size if not is_dir else None
-                entries.append(DirEntry(name=item.name, is_dir=is_dir, size=size))
-                if is_dir and current + 1 < max_depth:
-                    self._walk(item, entries, max_depth, current + 1)
-        except PermissionError:
+            os.unlink(self._resolve(path))
+        except FileNotFoundError:
             pass
 
+    async def list_directory(self, path: str, depth: int = 1) -> list[DirEntry]:
+        full = self._resolve(path)
+        return await asyncio.to_thread(_walk, full, depth)
+
     async def exec_command(
         self,
         command: str,
         timeout_ms: int = 30000,
         working_dir: str | None = None,
         env_vars: dict[str, str] | None = None,
+    ) -> ExecResult:
+        return await self._run(command, True, timeout_ms, working_dir, env_vars)
+
+    async def exec_argv(
+        self,
+        argv: list[str],
+        timeout_ms: int = 30000,
+        working_dir: str | None = None,
+        env_vars: dict[str, str] | None = None,
+    ) -> ExecResult:
+        """Run a program directly from an argument list, without a shell.
+
+        Arguments are passed through verbatim, so no quoting is needed.
+        """
+        try:
+            return await self._run(argv, False, timeout_ms, working_dir, env_vars)
+        except FileNotFoundError as e:
+            return ExecResult(stderr=str(e), exit_code=127)
+
+    async def _run(
+        self,
+        args: str | list[str],
+        shell: bool,
+        timeout_ms: int,
+        working_dir: str | None,
+        env_vars: dict[str, str] | None,
     ) -> ExecResult:
         cwd = self._resolve(working_dir) if working_dir else self._working_dir
-        env = _filter_env(env_vars)
+        env = self._command_env(env_vars)
         timeout_s = timeout_ms / 1000.0
         start = time.monotonic()
 
-        proc = await asyncio.create_subprocess_shell(
-            command,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-            cwd=cwd,
-            env=env,
-            start_new_session=True,
-        )
+        if shell:
+            proc = await asyncio.create_subprocess_shell(
+                args,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                cwd=cwd,
+                env=env,
+                start_new_session=True,
+            )
+        else:
+            proc = await asyncio.create_subprocess_exec(
+                *args,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                cwd=cwd,
+                env=env,
+                start_new_session=True,
+            )
 
         timed_out = False
         try:
@@ -112,25 +224,23 @@ class LocalExecutionEnvironment:
         except asyncio.TimeoutError:
             timed_out = True
             # SIGTERM first
-            try:
-                os.killpg(os.getpgid(proc.pid), signal.SIGTERM)
-            except (ProcessLookupError, OSError):
-                pass
+            _signal_group(proc, signal.SIGTERM)
             # Wait 2 seconds for graceful shutdown
             try:
                 await asyncio.wait_for(proc.communicate(), timeout=2.0)
             except asyncio.TimeoutError:
                 # SIGKILL
-                try:
-                    os.killpg(os.getpgid(proc.pid), signal.SIGKILL)
-                except (ProcessLookupError, OSError):
-                    pass
+                _signal_group(proc, signal.SIGKILL)
                 try:
                     await proc.communicate()
                 except Exception:
                     pass
             stdout = b""
             stderr = b"Command timed out"
+        except asyncio.CancelledError:
+            # Don't leave the child running after its caller is gone
+            _signal_group(proc, signal.SIGKILL)
+            raise
 
         duration_ms = int((time.monotonic() - start) * 1000)
         return ExecResult(
@@ -141,37 +251,53 @@ class LocalExecutionEnvironment:
             duration_ms=duration_ms,
         )
 
+    def _command_env(self, extra: dict[str, str] | None) -> dict[str, str]:
+        """Return the filtered environment, computing the base set only once."""
+        if self._base_env is None:
+            self._base_env = _filter_env()
+        if not extra:
+            return self._base_env
+        return {**self._base_env, **extra}
+
+    def refresh_env(self) -> None:
+        """Discard the cached environment so the next command re-reads it."""
+        self._base_env = None
+
     async def grep(self, pattern: str, path: str, **options: object) -> str:
-        args = ["grep", "-rn", pattern, self._resolve(path)]
         case_insensitive = options.get("case_insensitive", False)
-        if case_insensitive:
-            args.insert(1, "-i")
         glob_filter = options.get("glob_filter")
-        if glob_filter:
-            args.extend(["--include", str(glob_filter)])
         max_results = options.get("max_results")
-        if max_results:
-            args.extend(["-m", str(max_results)])
-        result = await self.exec_command(" ".join(args))
+        if self._rg_path:
+            # ripgrep searches in parallel; --hidden/--no-ignore keep grep -r's
+            # "search everything" semantics.
+            args = [self._rg_path, "-n", "--no-heading", "--hidden", "--no-ignore"]
+            if case_insensitive:
+                args.append("-i")
+            if glob_filter:
+                args.extend(["--glob", str(glob_filter)])
+            if max_results:
+                args.extend(["-m", str(max_results)])
+            args.extend(["-e", pattern, self._resolve(path)])
+        else:
+            # -E: extended syntax, close to ripgrep's, so a pattern means
+            # the same thing whichever backend runs it
+            args = ["grep", "-rnE", "-e", pattern, self._resolve(path)]
+            if case_insensitive:
+                args.insert(1, "-i")
+            if glob_filter:
+                args.extend(["--include", str(glob_filter)])
+            if max_results:
+                args.extend(["-m", str(max_results)])
+        result = await self.exec_argv(args)
+        # Exit status 2 is an error (e.g. an invalid pattern) rather than
+        # "no matches", so report it alongside any matches found
+        if result.exit_code == 2 and result.stderr:
+            return result.stdout + result.stderr
         return result.stdout
 
     async def glob(self, pattern: str, path: str = ".") -> list[str]:
-        import fnmatch
-
-        root = Path(self._resolve(path))
-        matches: list[str] = []
-        if "**" in pattern:
-            for p in root.rglob(pattern.replace("**/", "")):
-                matches.append(str(p.relative_to(root)))
-        else:
-            for p in root.iterdir():
-                if fnmatch.fnmatch(p.name, pattern):
-                    matches.append(str(p.relative_to(root)))
-        matches.sort(
-            key=lambda m: Path(self._resolve(os.path.join(path, m))).stat().st_mtime,
-            reverse=True,
-        )
-        return matches
+        root = self._resolve(path)
+        return await asyncio.to_thread(_glob, root, pattern)
 
     async def initialize(self) -> None:
         Path(self._working_dir).mkdir(parents=True, exist_ok=True)
@@ -4,11 +4,12 @@ from __future__ import annotations
 
 import asyncio
 import hashlib
-import json
+import threading
 import time
+from collections import deque
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, AsyncIterator, Callable
+from typing import Any, AsyncIterator, Callable, Sequence
 
 
 class EventKind(str, Enum):
@@ -27,7 +28,7 @@ class EventKind(str, Enum):
     ERROR = "error"
 
 
-@dataclass
+@dataclass(slots=True)
 class SessionEvent:
     kind: EventKind
     timestamp: float = field(default_factory=time.time)
@@ -42,31 +43,47 @@ class EventEmitter:
         self._subscribers: list[asyncio.Queue[SessionEvent]] = []
         self._callbacks: list[Callable[[SessionEvent], Any]] = []
 
-    def subscribe(self) -> asyncio.Queue[SessionEvent]:
-        """Create a new subscription queue."""
-        q: asyncio.Queue[SessionEvent] = asyncio.Queue()
+    def subscribe(self, maxsize: int = 0) -> asyncio.Queue[SessionEvent]:
+        """Create a new subscription queue.
+
+        With a positive ``maxsize`` the queue is bounded and events are
+        dropped for this subscriber while it is full, so a slow consumer never
+        stalls the session.
+        """
+        q: asyncio.Queue[SessionEvent] = asyncio.Queue(maxsize=maxsize)
         self._subscribers.append(q)
         return q
 
     def unsubscribe(self, queue: asyncio.Queue[SessionEvent]) -> None:
         """Remove a subscription queue."""
-        self._subscribers = [q for q in self._subscribers if q is not q]
+        self._subscribers = [q for q in self._subscribers if q is not queue]
 
     def on_event(self, callback: Callable[[SessionEvent], Any]) -> None:
         """Register a callback for all events."""
         self._callbacks.append(callback)
 
+    @property
+    def has_listeners(self) -> bool:
+        """Whether any queue or callback would receive an emitted event."""
+        return bool(self._subscribers or self._callbacks)
+
     async def emit(self, event: SessionEvent) -> None:
         """Emit an event to all subscribers and callbacks."""
         for q in self._subscribers:
-            await q.put(event)
+            try:
+                q.put_nowait(event)
+            except asyncio.QueueFull:
+                pass  # Drop for subscribers that are not keeping up
+        pending = []
         for cb in self._callbacks:
             try:
                 result = cb(event)
                 if asyncio.iscoroutine(result):
-                    await result
+                    pending.append(result)
             except Exception:
                 pass  # Don't let subscriber errors break the loop
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
 
     def emit_sync(self, event: SessionEvent) -> None:
         """Non-async emit for use in sync contexts (best-effort)."""
@@ -77,66 +94,109 @@ class EventEmitter:
                 pass
 
 
+def _canonical(obj: Any, out: bytearray) -> None:
+    """Append a canonical, type-tagged byte encoding of a JSON-like value.
+
+    Dict keys are emitted in sorted order so that argument ordering does not
+    affect the result. Strings are length-prefixed to keep the encoding
+    unambiguous without escaping.
+    """
+    t = type(obj)
+    if t is dict:
+        out += b"{"
+        for key in sorted(obj, key=str):
+            _canonical(key, out)
+            _canonical(obj[key], out)
+        out += b"}"
+    elif t is list or t is tuple:
+        out += b"["
+        for item in obj:
+            _canonical(item, out)
+        out += b"]"
+    elif t is str:
+        data = obj.encode("utf-8", "surrogatepass")
+        out += b"s%d:" % len(data)
+        out += data
+    elif obj is None:
+        out += b"n"
+    elif t is bool:
+        out += b"t" if obj else b"f"
+    elif t is int:
+        out += b"i%d;" % obj
+    elif t is float:
+        out += b"d" + repr(obj).encode() + b";"
+    else:
+        _canonical(repr(obj), out)
+
+
 def _tool_call_signature(name: str, arguments: dict[str, Any]) -> str:
-    """Create a signature hash for a tool call."""
-    key = json.dumps({"name": name, "args": arguments}, sort_keys=True)
-    return hashlib.md5(key.encode()).hexdigest()
+    """Create a signature hash for a tool call.
+
+    The signature is only compared for equality during loop detection, so a
+    fast non-cryptographic-strength digest (64-bit BLAKE2b) is sufficient.
+    """
+    out = bytearray()
+    _canonical(name, out)
+    _canonical(arguments, out)
+    return hashlib.blake2b(out, digest_size=8).hexdigest()
 
 
 def detect_loop(
-    signatures: list[str],
+    signatures: Sequence[str],
     window_size: int = 10,
 ) -> bool:
     """Detect repeating patterns in recent tool call signatures.
 
     Checks for repeating patterns of length 1, 2, or 3 within
-    the last `window_size` calls.
+    the last `window_size` calls. A window repeats with period ``p`` when
+    every signature equals the one ``p`` positions earlier, so the check
+    indexes into ``signatures`` directly instead of slicing copies.
     """
-    if len(signatures) < window_size:
+    n = len(signatures)
+    if n < window_size:
         return False
 
-    recent = signatures[-window_size:]
-
+    start = n - window_size
     for pattern_len in (1, 2, 3):
         if window_size % pattern_len != 0:
             continue
-        pattern = recent[:pattern_len]
-        all_match = True
-        for i in range(pattern_len, window_size, pattern_len):
-            if recent[i : i + pattern_len] != pattern:
-                all_match = False
-                break
-        if all_match:
+        if all(
+            signatures[i] == signatures[i - pattern_len]
+            for i in range(start + pattern_len, n)
+        ):
             return True
 
     return False
 
 
 class SteeringQueue:
-    """Thread-safe queue for injecting steering messages."""
+    """Thread-safe queue for injecting steering messages.
+
+    Backed by a lock-guarded deque: messages are only ever drained in bulk,
+    so no asyncio waiter machinery is needed.
+    """
 
     def __init__(self) -> None:
-        self._queue: asyncio.Queue[str] = asyncio.Queue()
+        self._messages: deque[str] = deque()
+        self._lock = threading.Lock()
 
     async def enqueue(self, message: str) -> None:
-        await self._queue.put(message)
+        self.enqueue_sync(message)
 
     def enqueue_sync(self, message: str) -> None:
-        self._queue.put_nowait(message)
+        with self._lock:
+            self._messages.append(message)
 
     async def drain(self) -> list[str]:
         """Drain all pending messages."""
-        messages: list[str] = []
-        while not self._queue.empty():
-            try:
-                messages.append(self._queue.get_nowait())
-            except asyncio.QueueEmpty:
-                break
+        with self._lock:
+            messages = list(self._messages)
+            self._messages.clear()
         return messages
 
     @property
     def empty(self) -> bool:
-        return self._queue.empty()
+        return not self._messages
 
 
 class FollowUpQueue:
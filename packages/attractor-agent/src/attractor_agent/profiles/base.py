@@ -44,9 +44,28 @@ class BaseProfile:
     supports_parallel_tool_calls: bool = True
     context_window_size: int = 128_000
     reasoning_effort: str | None = None
+    _prompt_cache: tuple[tuple[Any, ...], str] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _tool_block_cache: tuple[int, str] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _tools_cache: tuple[int, list[ToolDefinition]] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     def tools(self) -> list[ToolDefinition]:
-        return self.tool_registry.definitions()
+        """Tool definitions, rebuilt only when the registry changes.
+
+        The returned list is shared between calls and must not be mutated.
+        """
+        version = self.tool_registry.version
+        cached = self._tools_cache
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        definitions = self.tool_registry.definitions()
+        self._tools_cache = (version, definitions)
+        return definitions
 
     def build_system_prompt(
         self,
@@ -70,34 +89,66 @@ class BaseProfile:
         project_docs: list[str] | None = None,
         user_instructions: str | None = None,
     ) -> str:
-        """Assemble the 5-layer system prompt."""
+        """Assemble the 5-layer system prompt.
+
+        Stable layers come first (base instructions, tools, project docs) and
+        per-session ones last (environment, user instructions), so the
+        prompt's prefix stays byte-identical across turns and sessions and
+        can be served from provider-side prompt caches.
+
+        The result is memoized on its inputs and the tool registry version,
+        so repeated calls with unchanged inputs return the identical string.
+        """
+        env_items = tuple(sorted(environment.items())) if environment else ()
+        key = (
+            base_instructions,
+            env_items,
+            tuple(project_docs) if project_docs else (),
+            user_instructions,
+            self.tool_registry.version,
+        )
+        cached = self._prompt_cache
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
         layers: list[str] = []
 
         # Layer 1: Provider base instructions
         layers.append(base_instructions)
 
-        # Layer 2: Environment context
-        if environment:
-            env_block = "\n# Environment\n"
-            for key, val in environment.items():
-                env_block += f"- {key}: {val}\n"
-            layers.append(env_block)
+        # Layer 2: Tool descriptions
+        layers.append(self._tool_block())
 
-        # Layer 3: Tool descriptions
-        tool_block = "\n# Available Tools\n"
-        for t in self.tools():
-            tool_block += f"- **{t.name}**: {t.description}\n"
-        layers.append(tool_block)
-
-        # Layer 4: Project docs
+        # Layer 3: Project docs
         if project_docs:
-            docs_block = "\n# Project Documentation\n"
-            for doc in project_docs:
-                docs_block += doc + "\n\n"
-            layers.append(docs_block)
+            layers.append(
+                "\n# Project Documentation\n"
+                + "".join(f"{doc}\n\n" for doc in project_docs)
+            )
+
+        # Layer 4: Environment context
+        if env_items:
+            layers.append(
+                "\n# Environment\n"
+                + "".join(f"- {k}: {val}\n" for k, val in env_items)
+            )
 
         # Layer 5: User instructions
         if user_instructions:
             layers.append(f"\n# User Instructions\n{user_instructions}\n")
 
-        return "\n".join(layers)
+        prompt = "\n".join(layers)
+        self._prompt_cache = (key, prompt)
+        return prompt
+
+    def _tool_block(self) -> str:
+        """Render the tool description layer, rebuilt only when tools change."""
+        version = self.tool_registry.version
+        cached = self._tool_block_cache
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        tool_block = "\n# Available Tools\n" + "".join(
+            f"- **{t.name}**: {t.description}\n" for t in self.tools()
+        )
+        self._tool_block_cache = (version, tool_block)
+        return tool_block
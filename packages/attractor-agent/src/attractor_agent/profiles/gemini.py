@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 from dataclasses import dataclass, field
 from typing import Any
 
@@ -40,17 +41,26 @@ You are an expert software engineer. You help users with coding tasks.
 """
 
 
+# Maximum number of files read_many_files reads concurrently
+_READ_MANY_CONCURRENCY = 32
+
+
 def _make_read_many_files_tool(env: ExecutionEnvironment) -> ToolDefinition:
     """Create a read_many_files tool for batch file reading."""
 
     async def execute(file_paths: list[str]) -> str:
-        results = []
-        for path in file_paths:
-            try:
-                content = await env.read_file(path)
-                results.append(f"=== {path} ===\n{content}")
-            except Exception as e:
-                results.append(f"=== {path} ===\nError: {e}")
+        sem = asyncio.Semaphore(_READ_MANY_CONCURRENCY)
+
+        async def read_one(path: str) -> str:
+            async with sem:
+                try:
+                    content = await env.read_file(path)
+                    return f"=== {path} ===\n{content}"
+                except Exception as e:
+                    return f"=== {path} ===\nError: {e}"
+
+        # gather preserves input order, so output matches file_paths.
+        results = await asyncio.gather(*(read_one(p) for p in file_paths))
         return "\n\n".join(results)
 
     return ToolDefinition(
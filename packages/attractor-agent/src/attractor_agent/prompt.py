@@ -2,18 +2,26 @@
 
 from __future__ import annotations
 
+import functools
 import os
+import stat
 from pathlib import Path
 
 # Provider-specific instruction file mappings
-_PROVIDER_FILES: dict[str, set[str]] = {
-    "openai": {"AGENTS.md", ".codex/instructions.md"},
-    "anthropic": {"AGENTS.md", "CLAUDE.md"},
-    "gemini": {"AGENTS.md", "GEMINI.md"},
+_PROVIDER_FILES: dict[str, frozenset[str]] = {
+    "openai": frozenset({"AGENTS.md", ".codex/instructions.md"}),
+    "anthropic": frozenset({"AGENTS.md", "CLAUDE.md"}),
+    "gemini": frozenset({"AGENTS.md", "GEMINI.md"}),
 }
 
 # Universal files loaded for any provider
-_UNIVERSAL_FILES = {"AGENTS.md"}
+_UNIVERSAL_FILES = frozenset({"AGENTS.md"})
+
+# Load order within a directory, sorted once at import
+_PROVIDER_FILES_SORTED: dict[str, tuple[str, ...]] = {
+    provider: tuple(sorted(files)) for provider, files in _PROVIDER_FILES.items()
+}
+_UNIVERSAL_FILES_SORTED: tuple[str, ...] = tuple(sorted(_UNIVERSAL_FILES))
 
 MAX_PROJECT_DOCS_BYTES = 32 * 1024  # 32KB budget
 
@@ -51,8 +59,7 @@ def build_environment_context(
         lines.append(f"\nGit status:\n{git_status}")
     if git_recent_commits:
         lines.append("\nRecent commits:")
-        for commit in git_recent_commits[:10]:
-            lines.append(f"  {commit}")
+        lines.extend(f"  {commit}" for commit in git_recent_commits[:10])
 
     return "\n".join(lines)
 
@@ -65,9 +72,10 @@ def discover_project_docs(
     """Discover project instruction files from git root to working dir (Layer 4).
 
     Walks from git_root (or working_dir if not in git) to working_dir,
-    collecting provider-appropriate instruction files.
+    collecting provider-appropriate instruction files. File contents are
+    cached on (path, mtime, size), so unchanged files are not re-read.
     """
-    allowed_files = _PROVIDER_FILES.get(provider_id, _UNIVERSAL_FILES)
+    ordered_files = _PROVIDER_FILES_SORTED.get(provider_id, _UNIVERSAL_FILES_SORTED)
     root = Path(git_root) if git_root else Path(working_dir)
     cwd = Path(working_dir)
 
@@ -85,27 +93,63 @@ def discover_project_docs(
         # cwd is not under root
         dirs_to_check = [cwd]
 
+    # Top-level names that can hold a candidate (".codex" for nested ones)
+    heads = {filename.partition("/")[0] for filename in ordered_files}
+
+    found: list[tuple[str, int, int]] = []
+    for directory in dirs_to_check:
+        # One listdir per directory, intersected with the few candidate
+        # names; only the survivors are stat'ed.
+        try:
+            present = heads.intersection(os.listdir(directory))
+        except OSError:
+            continue
+        if not present:
+            continue
+        for filename in ordered_files:
+            if filename.partition("/")[0] not in present:
+                continue
+            filepath = str(directory / filename)
+            try:
+                st = os.stat(filepath)
+            except OSError:
+                continue
+            if stat.S_ISREG(st.st_mode):
+                found.append((filepath, st.st_mtime_ns, st.st_size))
+
+    return list(_load_project_docs(str(root), tuple(found)))
+
+
+@functools.lru_cache(maxsize=128)
+def _load_project_docs(
+    root: str, files: tuple[tuple[str, int, int], ...]
+) -> tuple[str, ...]:
+    """Read and budget the discovered files.
+
+    ``files`` carries each file's mtime and size, so any edit produces a new
+    cache key and the files are read again.
+    """
     docs: list[str] = []
     total_bytes = 0
 
-    for directory in dirs_to_check:
-        for filename in sorted(allowed_files):
-            filepath = directory / filename
-            if filepath.is_file():
-                try:
-                    content = filepath.read_text()
-                    if total_bytes + len(content.encode()) > MAX_PROJECT_DOCS_BYTES:
-                        remaining = MAX_PROJECT_DOCS_BYTES - total_bytes
-                        if remaining > 0:
-                            docs.append(content[:remaining])
-                            docs.append("[Project instructions truncated at 32KB]")
-                        return docs
-                    docs.append(f"# {filepath.relative_to(root)}\n\n{content}")
-                    total_bytes += len(content.encode())
-                except (OSError, UnicodeDecodeError):
-                    pass
-
-    return docs
+    for filepath, _mtime_ns, _size in files:
+        try:
+            # Budget on the raw bytes; only the retained part is decoded.
+            data = Path(filepath).read_bytes()
+            if total_bytes + len(data) > MAX_PROJECT_DOCS_BYTES:
+                remaining = MAX_PROJECT_DOCS_BYTES - total_bytes
+                if remaining > 0:
+                    # "ignore" drops a multi-byte character split by the cut
+                    docs.append(data[:remaining].decode("utf-8", errors="ignore"))
+                    docs.append("[Project instructions truncated at 32KB]")
+                return tuple(docs)
+            content = data.decode("utf-8")
+            docs.append(f"# {Path(filepath).relative_to(root)}\n\n{content}")
+            total_bytes += len(data)
+        except (OSError, UnicodeDecodeError):
+            pass
+
+    return tuple(docs)
 
 
 def build_system_prompt(
@@ -135,10 +179,10 @@ def build_system_prompt(
 
     # Layer 3: Tool descriptions
     if tool_descriptions:
-        tool_block = "# Available Tools\n"
-        for name, desc in tool_descriptions:
-            tool_block += f"\n## {name}\n{desc}\n"
-        layers.append(tool_block)
+        layers.append(
+            "# Available Tools\n"
+            + "".join(f"\n## {name}\n{desc}\n" for name, desc in tool_descriptions)
+        )
 
     # Layer 4: Project docs
     if project_docs:
@@ -6,9 +6,10 @@ import asyncio
 import inspect
 import time
 import uuid
+from collections import deque
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any
+from typing import Any, Callable
 
 from attractor_agent.events import (
     EventEmitter,
@@ -21,7 +22,7 @@ from attractor_agent.events import (
 )
 from attractor_agent.profiles.base import BaseProfile
 from attractor_agent.tools.registry import ToolRegistry
-from attractor_agent.tools.truncation import truncate_output
+from attractor_agent.tools.truncation import truncate_chars, truncate_output
 from attractor_llm.types import (
     Message,
     Request,
@@ -32,6 +33,10 @@ from attractor_llm.types import (
 )
 
 
+# Upper bound on tool calls from one response that run at the same time
+_MAX_PARALLEL_TOOL_CALLS = 8
+
+
 class SessionState(str, Enum):
     IDLE = "idle"
     PROCESSING = "processing"
@@ -49,6 +54,8 @@ class SessionConfig:
     enable_loop_detection: bool = True
     loop_detection_window: int = 10
     max_subagent_depth: int = 1
+    max_history_tokens: int = 0  # 0 = unlimited; otherwise compact history near this size
+    emit_full_tool_output: bool = True  # False: TOOL_CALL_END carries the truncated output
 
 
 @dataclass
@@ -109,8 +116,16 @@ class Session:
         self.followup_queue = FollowUpQueue()
         self.state = SessionState.IDLE
         self.abort_signaled = False
-        self._tool_signatures: list[str] = []
+        self.depth = 0  # subagent nesting level, set by SubAgentManager
+        # Loop detection only looks at the most recent window of calls
+        self._tool_signatures: deque[str] = deque(
+            maxlen=max(self.config.loop_detection_window * 4, 64)
+        )
         self._total_turns = 0
+        self._messages: list[Message] = []
+        self._converted_turns = 0
+        self._system_message: tuple[str, Message] | None = None
+        self._last_converted: Turn | None = None
 
     async def submit(self, user_input: str) -> None:
         """Submit user input and run the agentic loop."""
@@ -133,39 +148,160 @@ class Session:
         self.state = SessionState.CLOSED
 
     async def _emit(self, kind: EventKind, **data: Any) -> None:
+        if not self.event_emitter.has_listeners:
+            return  # Nobody is listening; skip building the event
         event = SessionEvent(kind=kind, session_id=self.id, data=data)
         await self.event_emitter.emit(event)
 
 
+def _user_to_messages(turn: UserTurn | SteeringTurn | SystemTurn) -> list[Message]:
+    return [Message.user(turn.content)]
+
+
+def _assistant_to_messages(turn: AssistantTurn) -> list[Message]:
+    msg = Message.assistant(turn.content)
+    if turn.tool_calls:
+        # Build assistant message with tool calls
+        msg.tool_calls = turn.tool_calls
+    return [msg]
+
+
+def _tool_results_to_messages(turn: ToolResultsTurn) -> list[Message]:
+    return [
+        Message.tool_result(
+            tool_call_id=tr.tool_call_id,
+            content=tr.content if isinstance(tr.content, str) else str(tr.content),
+            is_error=tr.is_error,
+        )
+        for tr in turn.results
+    ]
+
+
+# Converter per turn type, looked up by exact type on the hot path
+_TURN_CONVERTERS: dict[type, Callable[[Any], list[Message]]] = {
+    UserTurn: _user_to_messages,
+    AssistantTurn: _assistant_to_messages,
+    ToolResultsTurn: _tool_results_to_messages,
+    SteeringTurn: _user_to_messages,
+    SystemTurn: _user_to_messages,
+}
+
+
+def _turn_to_messages(turn: Turn) -> list[Message]:
+    """Convert a single history turn to LLM messages."""
+    convert = _TURN_CONVERTERS.get(type(turn))
+    if convert is None:
+        # Subclasses of the turn types resolve through their MRO
+        for base in type(turn).__mro__[1:]:
+            convert = _TURN_CONVERTERS.get(base)
+            if convert is not None:
+                break
+        else:
+            return []
+    return convert(turn)
+
+
 def _convert_history_to_messages(history: list[Turn]) -> list[Message]:
     """Convert session history to LLM messages."""
     messages: list[Message] = []
     for turn in history:
-        if isinstance(turn, UserTurn):
-            messages.append(Message.user(turn.content))
-        elif isinstance(turn, AssistantTurn):
-            if turn.tool_calls:
-                # Build assistant message with tool calls
-                msg = Message.assistant(turn.content)
-                msg.tool_calls = turn.tool_calls
-                messages.append(msg)
-            else:
-                messages.append(Message.assistant(turn.content))
-        elif isinstance(turn, ToolResultsTurn):
-            for tr in turn.results:
-                content = tr.content if isinstance(tr.content, str) else str(tr.content)
-                messages.append(
-                    Message.tool_result(
-                        tool_call_id=tr.tool_call_id,
-                        content=content,
-                        is_error=tr.is_error,
-                    )
-                )
-        elif isinstance(turn, (SteeringTurn, SystemTurn)):
-            messages.append(Message.user(turn.content))
+        messages.extend(_turn_to_messages(turn))
     return messages
 
 
+def _sync_messages(session: Session) -> list[Message]:
+    """Return the session's converted messages, converting only new turns.
+
+    History is append-only during the loop, so turns already converted are
+    kept. If history was shortened or rewritten (detected by checking the
+    last converted turn is still in place) the cache is rebuilt.
+    """
+    history = session.history
+    done = session._converted_turns
+    if done and (done > len(history) or history[done - 1] is not session._last_converted):
+        session._messages = []
+        done = 0
+    for turn in history[done:]:
+        session._messages.extend(_turn_to_messages(turn))
+    session._converted_turns = len(history)
+    session._last_converted = history[-1] if history else None
+    return session._messages
+
+
+def _estimate_tokens(turn: Turn) -> int:
+    """Rough token estimate for a turn (about four characters per token)."""
+    if isinstance(turn, AssistantTurn):
+        chars = len(turn.content) + sum(
+            len(tc.name) + len(str(tc.arguments)) for tc in turn.tool_calls
+        )
+    elif isinstance(turn, ToolResultsTurn):
+        chars = sum(
+            len(tr.content) if isinstance(tr.content, str) else len(str(tr.content))
+            for tr in turn.results
+        )
+    else:
+        chars = len(turn.content)
+    return chars // 4
+
+
+def _render_turn(turn: Turn) -> str:
+    """Plain-text rendering of a turn for a compaction summary."""
+    if isinstance(turn, UserTurn):
+        return f"User: {turn.content}"
+    if isinstance(turn, AssistantTurn):
+        calls = "".join(f"\n  [called {tc.name}({tc.arguments})]" for tc in turn.tool_calls)
+        return f"Assistant: {turn.content}{calls}"
+    if isinstance(turn, ToolResultsTurn):
+        return "\n".join(f"Tool result: {tr.content}" for tr in turn.results)
+    return f"Note: {turn.content}"
+
+
+def compact_history(
+    history: list[Turn], budget: int, keep_rounds: int = 2
+) -> list[Turn]:
+    """Fold older turns into one summary turn once history nears ``budget``.
+
+    When the estimated size exceeds 80% of ``budget`` tokens, everything
+    before the last ``keep_rounds`` assistant turns is replaced by a
+    SystemTurn holding a head/tail-truncated transcript of those turns. The
+    latest UserTurn is the instruction the agent is still working on, so it
+    is never folded and follows the summary verbatim. The kept suffix starts
+    at an assistant turn, so tool calls and their results are never split.
+    Returns ``history`` itself when nothing is folded.
+    """
+    if budget <= 0 or sum(_estimate_tokens(t) for t in history) <= budget * 0.8:
+        return history
+
+    split = 0
+    seen = 0
+    for i in range(len(history) - 1, -1, -1):
+        if isinstance(history[i], AssistantTurn):
+            seen += 1
+            if seen == keep_rounds:
+                split = i
+                break
+
+    kept: list[Turn] = []
+    folded = history[:split]
+    for i in range(len(history) - 1, -1, -1):
+        if isinstance(history[i], UserTurn):
+            if i < split:
+                kept = [history[i]]
+                folded = history[:i] + history[i + 1:split]
+            break
+    if len(folded) < 2:
+        return history
+
+    transcript = "\n\n".join(_render_turn(t) for t in folded)
+    # The summary gets about a quarter of the token budget.
+    summary = truncate_chars(transcript, budget)
+    return [
+        SystemTurn(content=f"[Summary of earlier conversation]\n{summary}"),
+        *kept,
+        *history[split:],
+    ]
+
+
 async def process_input(session: Session, user_input: str) -> None:
     """Run the core agentic loop for a single user input."""
     session.state = SessionState.PROCESSING
@@ -177,6 +313,11 @@ async def process_input(session: Session, user_input: str) -> None:
 
     round_count = 0
 
+    # The system prompt's inputs and the provider options don't change
+    # within one submission, so build them once rather than every tool round.
+    system_message = _system_message(session)
+    provider_options = session.profile.provider_options()
+
     while True:
         # 1. Check limits
         if (
@@ -195,26 +336,36 @@ async def process_input(session: Session, user_input: str) -> None:
             break
 
         # 2. Build LLM request
-        system_prompt = session.profile.build_system_prompt()
-        messages = _convert_history_to_messages(session.history)
+        if session.config.max_history_tokens > 0:
+            compacted = compact_history(
+                session.history, session.config.max_history_tokens
+            )
+            if compacted is not session.history:
+                session.history = compacted
+                session._converted_turns = 0
+                session._messages = []
+        messages = _sync_messages(session)
         tool_defs = session.profile.tools()
 
         request = Request(
             model=session.profile.model,
-            messages=[Message.system(system_prompt)] + messages,
+            messages=[system_message, *messages],
             tools=tool_defs if tool_defs else None,
             reasoning_effort=session.config.reasoning_effort,
             provider=session.profile.id,
-            provider_options=session.profile.provider_options(),
+            provider_options=provider_options,
         )
 
         # 3. Call LLM
         response = await session.llm_client.complete(request)
+        # Response.tool_calls rebuilds ToolCall objects on every access; read
+        # it once so every later step sees the same call records.
+        tool_calls = response.tool_calls
 
         # 4. Record assistant turn
         assistant_turn = AssistantTurn(
             content=response.text,
-            tool_calls=response.tool_calls,
+            tool_calls=tool_calls,
             reasoning=response.reasoning,
             usage=response.usage,
             response_id=response.id,
@@ -227,12 +378,12 @@ async def process_input(session: Session, user_input: str) -> None:
         )
 
         # 5. If no tool calls, natural completion
-        if not response.tool_calls:
+        if not tool_calls:
             break
 
         # 6. Execute tool calls
         round_count += 1
-        results = await _execute_tool_calls(session, response.tool_calls)
+        results = await _execute_tool_calls(session, tool_calls)
         session.history.append(ToolResultsTurn(results=results))
 
         # 7. Drain steering messages
@@ -240,10 +391,9 @@ async def process_input(session: Session, user_input: str) -> None:
 
         # 8. Loop detection
         if session.config.enable_loop_detection:
-            for tc in response.tool_calls:
-                session._tool_signatures.append(
-                    _tool_call_signature(tc.name, tc.arguments)
-                )
+            session._tool_signatures.extend(
+                _tool_call_signature(tc.name, tc.arguments) for tc in tool_calls
+            )
             if detect_loop(session._tool_signatures, session.config.loop_detection_window):
                 warning = (
                     f"Loop detected: the last {session.config.loop_detection_window} "
@@ -261,6 +411,22 @@ async def process_input(session: Session, user_input: str) -> None:
     session.state = SessionState.IDLE
 
 
+def _system_message(session: Session) -> Message:
+    """Return the system Message, reusing it while the prompt is unchanged.
+
+    Memoizing profiles hand back the identical string, which is checked
+    first; profiles that rebuild the prompt each call fall back to an
+    equality check before a new Message is allocated.
+    """
+    prompt = session.profile.build_system_prompt()
+    cached = session._system_message
+    if cached is not None and (cached[0] is prompt or cached[0] == prompt):
+        return cached[1]
+    message = Message.system(prompt)
+    session._system_message = (prompt, message)
+    return message
+
+
 async def _drain_steering(session: Session) -> None:
     """Drain all pending steering messages into history."""
     messages = await session.steering_queue.drain()
@@ -282,24 +448,32 @@ async def _execute_tool_calls(
         result = await registry.execute(tc.name, tc.arguments)
         result.tool_call_id = tc.id
 
-        # Emit full untruncated output
+        # Truncate for LLM consumption; the result only keeps the truncated
+        # text, so the full output is dropped once the event is delivered.
+        output = result.content
+        if isinstance(output, str):
+            result.content = truncate_output(output, tc.name).text
+        if not session.config.emit_full_tool_output:
+            output = result.content
+
         await session._emit(
             EventKind.TOOL_CALL_END,
             tool_name=tc.name,
             call_id=tc.id,
-            output=result.content,
+            output=output,
             is_error=result.is_error,
         )
-
-        # Truncate for LLM consumption
-        if isinstance(result.content, str):
-            truncated = truncate_output(result.content, tc.name)
-            result.content = truncated.text
-
         return result
 
     if session.profile.supports_parallel_tool_calls and len(tool_calls) > 1:
-        results = await asyncio.gather(*[run_one(tc) for tc in tool_calls])
-        return list(results)
+        sem = asyncio.Semaphore(_MAX_PARALLEL_TOOL_CALLS)
+
+        async def bounded(tc: ToolCall) -> ToolResult:
+            async with sem:
+                return await run_one(tc)
+
+        # gather rather than a TaskGroup: a failing event listener surfaces
+        # as its own exception and does not cancel sibling tool calls
+        return list(await asyncio.gather(*(bounded(tc) for tc in tool_calls)))
     else:
         return [await run_one(tc) for tc in tool_calls]
@@ -2,11 +2,11 @@
 
 from __future__ import annotations
 
-import uuid
-from dataclasses import dataclass, field
+import secrets
+from dataclasses import dataclass, field, replace
 from typing import Any
 
-from attractor_agent.session import Session, SessionConfig, SessionState
+from attractor_agent.session import AssistantTurn, Session, SessionConfig, SessionState
 from attractor_llm.types import ToolDefinition
 
 
@@ -34,13 +34,8 @@ class SubAgentManager:
 
     @property
     def current_depth(self) -> int:
-        """Track nesting depth via parent chain."""
-        depth = 0
-        session = self._parent
-        while hasattr(session, '_parent_session') and session._parent_session is not None:
-            depth += 1
-            session = session._parent_session
-        return depth
+        """Nesting depth of the parent session (0 for a top-level session)."""
+        return self._parent.depth
 
     async def spawn(
         self,
@@ -56,13 +51,12 @@ class SubAgentManager:
                 f"Maximum subagent depth ({max_depth}) exceeded"
             )
 
-        agent_id = str(uuid.uuid4())[:8]
+        agent_id = secrets.token_hex(4)
 
         # Create child session sharing parent's environment and profile
         profile = self._parent.profile
         if model:
             # Clone profile with different model
-            from dataclasses import replace
             profile = replace(profile, model=model)
 
         config = SessionConfig(max_turns=max_turns)
@@ -73,6 +67,7 @@ class SubAgentManager:
             config=config,
         )
         child._parent_session = self._parent  # type: ignore[attr-defined]
+        child.depth = self._parent.depth + 1
 
         handle = SubAgentHandle(id=agent_id, session=child, status="running")
         self._agents[agent_id] = handle
@@ -82,7 +77,6 @@ class SubAgentManager:
             await child.submit(task)
             handle.status = "completed"
             # Extract final text from last assistant turn
-            from attractor_agent.session import AssistantTurn
             output = ""
             for turn in reversed(child.history):
                 if isinstance(turn, AssistantTurn) and turn.content:
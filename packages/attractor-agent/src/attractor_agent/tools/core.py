@@ -2,37 +2,128 @@
 
 from __future__ import annotations
 
+import functools
+from typing import Any
+
 from attractor_agent.environments.base import ExecutionEnvironment
-from attractor_agent.tools.truncation import truncate_output
+from attractor_agent.tools.truncation import (
+    CHAR_LIMITS,
+    DEFAULT_LINE_LIMIT,
+    LINE_LIMITS,
+    split_head_tail,
+    truncate_output,
+)
 from attractor_llm.types import ToolDefinition
 
+# JSON-schema parameter blocks, shared by every tool instance
+_READ_FILE_PARAMS: dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "file_path": {"type": "string", "description": "Path to the file to read"},
+        "offset": {"type": "integer", "description": "Line number to start reading from (1-based)"},
+        "limit": {"type": "integer", "description": "Number of lines to read"},
+    },
+    "required": ["file_path"],
+}
+
+_WRITE_FILE_PARAMS: dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "file_path": {"type": "string", "description": "Path to the file to write"},
+        "content": {"type": "string", "description": "Content to write to the file"},
+    },
+    "required": ["file_path", "content"],
+}
+
+_EDIT_FILE_PARAMS: dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "file_path": {"type": "string", "description": "Path to the file to edit"},
+        "old_string": {"type": "string", "description": "The exact text to find and replace"},
+        "new_string": {"type": "string", "description": "The replacement text"},
+        "replace_all": {
+            "type": "boolean",
+            "description": "Replace all occurrences (default false)",
+            "default": False,
+        },
+    },
+    "required": ["file_path", "old_string", "new_string"],
+}
+
+_GREP_PARAMS: dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "pattern": {"type": "string", "description": "Extended regex pattern to search for"},
+        "path": {"type": "string", "description": "File or directory to search (default '.')"},
+        "glob_filter": {"type": "string", "description": "Glob pattern to filter files (e.g. '*.py')"},
+        "case_insensitive": {"type": "boolean", "description": "Case-insensitive search", "default": False},
+        "max_results": {"type": "integer", "description": "Maximum number of matches to return"},
+    },
+    "required": ["pattern"],
+}
+
+_GLOB_PARAMS: dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "pattern": {"type": "string", "description": "Glob pattern (e.g. '**/*.py')"},
+        "path": {"type": "string", "description": "Base directory to search from (default '.')"},
+    },
+    "required": ["pattern"],
+}
+
+# Formatter for one numbered line of read_file output
+_NUMBERED_LINE = "{:6d}\t{}".format
+
+# Lines read_file keeps (head and tail) before the rest is cut
+_READ_FILE_LINE_LIMIT = LINE_LIMITS.get("read_file", DEFAULT_LINE_LIMIT)
+
+
+def _number_lines(text: str, start: int) -> str:
+    """Prefix each line with its line number, counting from start."""
+    lines = text.split("\n")
+    tail = ""
+    if lines[-1] == "":
+        lines.pop()
+        tail = "\n" if lines else ""
+    return "\n".join(
+        map(_NUMBERED_LINE, range(start, start + len(lines)), lines)
+    ) + tail
+
+
+def _numbered_length(text: str, start: int) -> int:
+    """Upper bound on the length of _number_lines(text, start)."""
+    lines = text.count("\n") + 1
+    width = max(6, len(str(start + lines)))
+    return len(text) + (width + 1) * lines
+
 
 def make_read_file_tool(env: ExecutionEnvironment) -> ToolDefinition:
     """Create a read_file tool bound to an environment."""
 
     async def execute(file_path: str, offset: int | None = None, limit: int | None = None) -> str:
         content = await env.read_file(file_path, offset=offset, limit=limit)
-        # Add line numbers
-        lines = content.splitlines(keepends=True)
-        start = (offset or 1)
-        numbered = []
-        for i, line in enumerate(lines):
-            numbered.append(f"{start + i:6d}\t{line}")
-        result = "".join(numbered)
-        return truncate_output(result, "read_file").text
+        start = max(offset or 1, 1)
+        # Only the head and tail lines survive line truncation, so a long
+        # file has just those numbered. This shortcut is taken only when the
+        # fully numbered text would fit the character limit: otherwise
+        # truncate_output cuts characters before lines, and its notices
+        # must report what that pass drops.
+        split = split_head_tail(content, _READ_FILE_LINE_LIMIT)
+        if split is None or _numbered_length(content, start) > CHAR_LIMITS["read_file"]:
+            return truncate_output(_number_lines(content, start), "read_file").text
+        head, tail, removed = split
+        tail_start = start + _READ_FILE_LINE_LIMIT // 2 + removed
+        result = (
+            _number_lines(head, start)
+            + f"\n... [truncated {removed} lines] ...\n"
+            + _number_lines(tail, tail_start)
+        )
+        return result
 
     return ToolDefinition(
         name="read_file",
         description="Read a file from the filesystem. Returns line-numbered content.",
-        parameters={
-            "type": "object",
-            "properties": {
-                "file_path": {"type": "string", "description": "Path to the file to read"},
-                "offset": {"type": "integer", "description": "Line number to start reading from (1-based)"},
-                "limit": {"type": "integer", "description": "Number of lines to read"},
-            },
-            "required": ["file_path"],
-        },
+        parameters=_READ_FILE_PARAMS,
         execute=execute,
     )
 
@@ -48,14 +139,7 @@ def make_write_file_tool(env: ExecutionEnvironment) -> ToolDefinition:
     return ToolDefinition(
         name="write_file",
         description="Write content to a file, creating parent directories as needed.",
-        parameters={
-            "type": "object",
-            "properties": {
-                "file_path": {"type": "string", "description": "Path to the file to write"},
-                "content": {"type": "string", "description": "Content to write to the file"},
-            },
-            "required": ["file_path", "content"],
-        },
+        parameters=_WRITE_FILE_PARAMS,
         execute=execute,
     )
 
@@ -67,22 +151,29 @@ def make_edit_file_tool(env: ExecutionEnvironment) -> ToolDefinition:
         file_path: str, old_string: str, new_string: str, replace_all: bool = False
     ) -> str:
         content = await env.read_file(file_path)
-        count = content.count(old_string)
-
-        if count == 0:
-            return f"Error: old_string not found in {file_path}"
-        if count > 1 and not replace_all:
-            return (
-                f"Error: old_string found {count} times in {file_path}. "
-                "Use replace_all=true to replace all occurrences, "
-                "or provide more context to make the match unique."
-            )
+        if not old_string:
+            return "Error: old_string must not be empty"
 
         if replace_all:
-            new_content = content.replace(old_string, new_string)
-            replaced = count
+            # One scan finds every occurrence; the count falls out of it
+            parts = content.split(old_string)
+            replaced = len(parts) - 1
+            if replaced == 0:
+                return f"Error: old_string not found in {file_path}"
+            new_content = new_string.join(parts)
         else:
-            new_content = content.replace(old_string, new_string, 1)
+            first = content.find(old_string)
+            if first < 0:
+                return f"Error: old_string not found in {file_path}"
+            end = first + len(old_string)
+            if content.find(old_string, end) >= 0:
+                count = content.count(old_string)
+                return (
+                    f"Error: old_string found {count} times in {file_path}. "
+                    "Use replace_all=true to replace all occurrences, "
+                    "or provide more context to make the match unique."
+                )
+            new_content = content[:first] + new_string + content[end:]
             replaced = 1
 
         await env.write_file(file_path, new_content)
@@ -91,24 +182,31 @@ def make_edit_file_tool(env: ExecutionEnvironment) -> ToolDefinition:
     return ToolDefinition(
         name="edit_file",
         description="Edit a file by replacing exact string matches.",
-        parameters={
-            "type": "object",
-            "properties": {
-                "file_path": {"type": "string", "description": "Path to the file to edit"},
-                "old_string": {"type": "string", "description": "The exact text to find and replace"},
-                "new_string": {"type": "string", "description": "The replacement text"},
-                "replace_all": {
-                    "type": "boolean",
-                    "description": "Replace all occurrences (default false)",
-                    "default": False,
-                },
-            },
-            "required": ["file_path", "old_string", "new_string"],
-        },
+        parameters=_EDIT_FILE_PARAMS,
         execute=execute,
     )
 
 
+@functools.lru_cache(maxsize=None)
+def _shell_params(default_timeout_ms: int) -> dict[str, Any]:
+    """Shell parameter schema, built once per default timeout."""
+    return {
+        "type": "object",
+        "properties": {
+            "command": {"type": "string", "description": "The shell command to execute"},
+            "timeout_ms": {
+                "type": "integer",
+                "description": f"Timeout in milliseconds (default {default_timeout_ms})",
+            },
+            "description": {
+                "type": "string",
+                "description": "Brief description of what this command does",
+            },
+        },
+        "required": ["command"],
+    }
+
+
 def make_shell_tool(env: ExecutionEnvironment, default_timeout_ms: int = 30000) -> ToolDefinition:
     """Create a shell tool bound to an environment."""
 
@@ -132,21 +230,7 @@ def make_shell_tool(env: ExecutionEnvironment, default_timeout_ms: int = 30000)
     return ToolDefinition(
         name="shell",
         description="Execute a shell command and return stdout, stderr, and exit code.",
-        parameters={
-            "type": "object",
-            "properties": {
-                "command": {"type": "string", "description": "The shell command to execute"},
-                "timeout_ms": {
-                    "type": "integer",
-                    "description": f"Timeout in milliseconds (default {default_timeout_ms})",
-                },
-                "description": {
-                    "type": "string",
-                    "description": "Brief description of what this command does",
-                },
-            },
-            "required": ["command"],
-        },
+        parameters=_shell_params(default_timeout_ms),
         execute=execute,
     )
 
@@ -175,18 +259,11 @@ def make_grep_tool(env: ExecutionEnvironment) -> ToolDefinition:
 
     return ToolDefinition(
         name="grep",
-        description="Search file contents using regex patterns.",
-        parameters={
-            "type": "object",
-            "properties": {
-                "pattern": {"type": "string", "description": "Regex pattern to search for"},
-                "path": {"type": "string", "description": "File or directory to search (default '.')"},
-                "glob_filter": {"type": "string", "description": "Glob pattern to filter files (e.g. '*.py')"},
-                "case_insensitive": {"type": "boolean", "description": "Case-insensitive search", "default": False},
-                "max_results": {"type": "integer", "description": "Maximum number of matches to return"},
-            },
-            "required": ["pattern"],
-        },
+        description=(
+            "Search file contents using regex patterns "
+            "(extended syntax: unescaped | ( ) + ? are operators)."
+        ),
+        parameters=_GREP_PARAMS,
         execute=execute,
     )
 
@@ -203,14 +280,7 @@ def make_glob_tool(env: ExecutionEnvironment) -> ToolDefinition:
     return ToolDefinition(
         name="glob",
         description="Find files matching a glob pattern, sorted by modification time.",
-        parameters={
-            "type": "object",
-            "properties": {
-                "pattern": {"type": "string", "description": "Glob pattern (e.g. '**/*.py')"},
-                "path": {"type": "string", "description": "Base directory to search from (default '.')"},
-            },
-            "required": ["pattern"],
-        },
+        parameters=_GLOB_PARAMS,
         execute=execute,
     )
 
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 import os
-import re
+import sys
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Literal
@@ -12,10 +12,55 @@ from attractor_agent.environments.base import ExecutionEnvironment
 from attractor_llm.types import ToolDefinition
 
 
+# Role bits for a hunk line prefix: present in the file before the hunk is
+# applied, and/or present after. Context lines are both.
+_IN_FILE = 1
+_IN_OUTPUT = 2
+_PREFIX_ROLES: dict[str, int] = {" ": _IN_FILE | _IN_OUTPUT, "-": _IN_FILE, "+": _IN_OUTPUT}
+
+
+@dataclass
+class CompiledHunk:
+    """Matching and output data derived from a Hunk, built once per hunk."""
+
+    existing: list[str]  # context and delete lines, as they should be in the file
+    rstripped_existing: list[str]  # existing, trailing whitespace removed
+    normalized_existing: list[str]  # existing, whitespace-normalized
+    output: list[str]  # context and add lines, as they will be written
+    context_hint: str  # stripped hint
+
+
 @dataclass
 class Hunk:
     context_hint: str = ""
     lines: list[tuple[str, str]] = field(default_factory=list)  # (prefix, content)
+    _compiled: CompiledHunk | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def compile(self) -> CompiledHunk:
+        """Return the compiled form, built on first use.
+
+        Hunks are treated as immutable once compiled.
+        """
+        if self._compiled is None:
+            existing: list[str] = []
+            output: list[str] = []
+            # One classifying pass over the hunk body
+            for prefix, content in self.lines:
+                role = _PREFIX_ROLES.get(prefix, 0)
+                if role & _IN_FILE:
+                    existing.append(content)
+                if role & _IN_OUTPUT:
+                    output.append(content)
+            self._compiled = CompiledHunk(
+                existing=existing,
+                rstripped_existing=[c.rstrip() for c in existing],
+                normalized_existing=[_normalize(c) for c in existing],
+                output=output,
+                context_hint=self.context_hint.strip(),
+            )
+        return self._compiled
 
 
 @dataclass
@@ -27,54 +72,75 @@ class PatchOp:
     hunks: list[Hunk] = field(default_factory=list)
 
 
+# v4a operation headers and their lengths, for slicing off the path
+_ADD = "*** Add File: "
+_ADD_LEN = len(_ADD)
+_DELETE = "*** Delete File: "
+_DELETE_LEN = len(_DELETE)
+_UPDATE = "*** Update File: "
+_UPDATE_LEN = len(_UPDATE)
+_MOVE = "*** Move to: "
+_MOVE_LEN = len(_MOVE)
+
+# Line prefixes that belong to a hunk body
+_HUNK_PREFIXES = frozenset({" ", "-", "+"})
+
+
 def parse_patch(text: str) -> list[PatchOp]:
     """Parse a v4a patch string into operations."""
     lines = text.splitlines()
+    n = len(lines)
     ops: list[PatchOp] = []
 
     i = 0
     # Find "*** Begin Patch"
-    while i < len(lines) and lines[i].strip() != "*** Begin Patch":
+    while i < n and lines[i].strip() != "*** Begin Patch":
         i += 1
     i += 1  # skip Begin Patch
 
-    while i < len(lines):
+    while i < n:
         line = lines[i]
         if line.strip() == "*** End Patch":
             break
 
-        if line.startswith("*** Add File: "):
-            path = line[len("*** Add File: "):].strip()
+        if line.startswith(_ADD):
+            path = line[_ADD_LEN:].strip()
             i += 1
             added: list[str] = []
-            while i < len(lines) and not lines[i].startswith("***") and not lines[i].startswith("@@"):
-                if lines[i].startswith("+"):
-                    added.append(lines[i][1:])
+            while i < n:
+                raw = lines[i]
+                if raw.startswith(("***", "@@")):
+                    break
+                if raw[:1] == "+":
+                    added.append(raw[1:])
                 i += 1
             ops.append(PatchOp(kind="add", path=path, added_lines=added))
 
-        elif line.startswith("*** Delete File: "):
-            path = line[len("*** Delete File: "):].strip()
+        elif line.startswith(_DELETE):
+            path = line[_DELETE_LEN:].strip()
             i += 1
             ops.append(PatchOp(kind="delete", path=path))
 
-        elif line.startswith("*** Update File: "):
-            path = line[len("*** Update File: "):].strip()
+        elif line.startswith(_UPDATE):
+            path = line[_UPDATE_LEN:].strip()
             i += 1
             move_to = None
-            if i < len(lines) and lines[i].startswith("*** Move to: "):
-                move_to = lines[i][len("*** Move to: "):].strip()
+            if i < n and lines[i].startswith(_MOVE):
+                move_to = lines[i][_MOVE_LEN:].strip()
                 i += 1
             hunks: list[Hunk] = []
-            while i < len(lines) and not lines[i].startswith("***"):
+            while i < n and not lines[i].startswith("***"):
                 if lines[i].startswith("@@ "):
                     hint = lines[i][3:].strip()
                     i += 1
                     hunk_lines: list[tuple[str, str]] = []
-                    while i < len(lines) and not lines[i].startswith("@@") and not lines[i].startswith("***"):
+                    while i < n:
                         raw = lines[i]
-                        if raw and raw[0] in (" ", "-", "+"):
-                            hunk_lines.append((raw[0], raw[1:]))
+                        if raw.startswith(("@@", "***")):
+                            break
+                        prefix = raw[:1]
+                        if prefix in _HUNK_PREFIXES:
+                            hunk_lines.append((prefix, raw[1:]))
                         i += 1
                     hunks.append(Hunk(context_hint=hint, lines=hunk_lines))
                 else:
@@ -91,122 +157,154 @@ def _find_hunk_position(file_lines: list[str], hunk: Hunk) -> int:
 
     Returns the index in file_lines where the hunk's context starts.
     """
-    # Build the sequence of context and delete lines (what should exist in file)
-    existing = [(prefix, content) for prefix, content in hunk.lines if prefix in (" ", "-")]
-    if not existing:
+    compiled = hunk.compile()
+    if not compiled.existing:
         return 0
 
     # Try exact match
-    pos = _match_lines(file_lines, existing)
+    pos = _match_lines(file_lines, compiled.existing)
+    if pos >= 0:
+        return pos
+
+    # Try ignoring trailing whitespace, the most common drift
+    pos = _rstrip_match(file_lines, compiled.rstripped_existing)
     if pos >= 0:
         return pos
 
     # Try fuzzy match (whitespace normalized)
-    pos = _fuzzy_match(file_lines, existing)
+    pos = _fuzzy_match(file_lines, compiled.normalized_existing)
     if pos >= 0:
         return pos
 
     # Use context hint
-    if hunk.context_hint:
+    hint = compiled.context_hint
+    if hint:
         for idx, fl in enumerate(file_lines):
-            if hunk.context_hint.strip() in fl.strip():
+            if hint in fl.strip():
                 return idx
 
     return 0
 
 
-def _match_lines(file_lines: list[str], existing: list[tuple[str, str]]) -> int:
+def _match_lines(file_lines: list[str], existing: list[str]) -> int:
     """Exact match of context/delete lines in file."""
-    n = len(existing)
-    for start in range(len(file_lines) - n + 1):
-        match = True
-        for j, (prefix, content) in enumerate(existing):
-            if file_lines[start + j] != content:
-                match = False
-                break
-        if match:
-            return start
-    return -1
+    return _find_window(file_lines, existing)
+
 
+def _rstrip_match(file_lines: list[str], rstripped_existing: list[str]) -> int:
+    """Match ignoring trailing whitespace."""
+    return _find_window([line.rstrip() for line in file_lines], rstripped_existing)
 
-def _fuzzy_match(file_lines: list[str], existing: list[tuple[str, str]]) -> int:
+
+def _fuzzy_match(file_lines: list[str], normalized_existing: list[str]) -> int:
     """Fuzzy match with whitespace normalization."""
-    n = len(existing)
-    for start in range(len(file_lines) - n + 1):
-        match = True
-        for j, (prefix, content) in enumerate(existing):
-            if _normalize(file_lines[start + j]) != _normalize(content):
-                match = False
-                break
-        if match:
+    # Normalize every line once, not once per candidate window
+    return _find_window([_normalize(line) for line in file_lines], normalized_existing)
+
+
+# Polynomial rolling hash parameters for _find_window (Mersenne prime modulus)
+_HASH_BASE = 1315423911
+_HASH_MOD = (1 << 61) - 1
+
+
+def _find_window(lines: list[str], target: list[str]) -> int:
+    """Index of the first run of ``lines`` equal to ``target``, or -1.
+
+    Rabin-Karp over per-line hashes: the window hash is updated in O(1) per
+    step and lines are only compared where the hashes agree.
+    """
+    n = len(target)
+    if n > len(lines):
+        return -1
+    if n == 0:
+        return 0
+    base, mod = _HASH_BASE, _HASH_MOD
+    hashes = [hash(line) % mod for line in lines]
+    want = 0
+    for line in target:
+        want = (want * base + hash(line) % mod) % mod
+    cur = 0
+    for h in hashes[:n]:
+        cur = (cur * base + h) % mod
+    top = pow(base, n - 1, mod)
+    last = len(lines) - n
+    for start in range(last + 1):
+        if cur == want and lines[start:start + n] == target:
             return start
+        if start < last:
+            cur = ((cur - hashes[start] * top) * base + hashes[start + n]) % mod
     return -1
 
 
 def _normalize(s: str) -> str:
-    """Normalize whitespace for fuzzy matching."""
-    return re.sub(r"\s+", " ", s.strip())
+    """Normalize whitespace for fuzzy matching.
 
+    Results are interned, so the many repeated forms in source files (blank
+    lines, lone braces) share one object and compare by identity.
+    """
+    return sys.intern(" ".join(s.split()))
 
-def apply_hunk(file_lines: list[str], hunk: Hunk) -> list[str]:
-    """Apply a single hunk to file lines, returning new lines."""
-    pos = _find_hunk_position(file_lines, hunk)
-    result = list(file_lines[:pos])
 
-    # Count how many existing lines the hunk covers
-    existing_count = sum(1 for p, _ in hunk.lines if p in (" ", "-"))
+def _hunk_splice(file_lines: list[str], hunk: Hunk) -> tuple[int, int, list[str]]:
+    """Locate a hunk: the slice of file_lines it replaces and the new lines."""
+    pos = _find_hunk_position(file_lines, hunk)
+    compiled = hunk.compile()
+    return pos, pos + len(compiled.existing), compiled.output
 
-    for prefix, content in hunk.lines:
-        if prefix == " ":
-            result.append(content)
-        elif prefix == "+":
-            result.append(content)
-        # "-" lines are skipped (deleted)
 
-    # Append remaining file lines after the hunk's range
-    result.extend(file_lines[pos + existing_count:])
-    return result
+def apply_hunk(file_lines: list[str], hunk: Hunk) -> list[str]:
+    """Apply a single hunk to file lines, returning new lines."""
+    start, end, new_lines = _hunk_splice(file_lines, hunk)
+    return file_lines[:start] + new_lines + file_lines[end:]
 
 
 async def apply_patch(env: ExecutionEnvironment, patch_text: str) -> str:
-    """Apply a v4a patch to the environment's filesystem."""
+    """Apply a v4a patch to the environment's filesystem.
+
+    Operations are applied in patch order. The first failing operation
+    aborts the patch with its own error; operations before it stay
+    applied and later ones are not attempted.
+    """
     ops = parse_patch(patch_text)
-    results: list[str] = []
-
-    for op in ops:
-        if op.kind == "add":
-            content = "\n".join(op.added_lines)
-            if op.added_lines:
-                content += "\n"
-            await env.write_file(op.path, content)
-            results.append(f"Added {op.path}")
-
-        elif op.kind == "delete":
-            # Write empty to signal deletion; real impl would use os.remove
-            result = await env.exec_command(f"rm -f {op.path}")
-            results.append(f"Deleted {op.path}")
-
-        elif op.kind == "update":
-            content = await env.read_file(op.path)
-            file_lines = content.splitlines()
-
-            for hunk in op.hunks:
-                file_lines = apply_hunk(file_lines, hunk)
-
-            new_content = "\n".join(file_lines)
-            if file_lines:
-                new_content += "\n"
-
-            target_path = op.move_to or op.path
-            await env.write_file(target_path, new_content)
-
-            if op.move_to and op.move_to != op.path:
-                await env.exec_command(f"rm -f {op.path}")
-                results.append(f"Updated and moved {op.path} → {op.move_to}")
-            else:
-                results.append(f"Updated {op.path}")
-
-    return "\n".join(results) if results else "No operations in patch"
+    if not ops:
+        return "No operations in patch"
+    results = [await _apply_op(env, op) for op in ops]
+    return "\n".join(results)
+
+
+async def _apply_op(env: ExecutionEnvironment, op: PatchOp) -> str:
+    """Apply one patch operation and return its result line."""
+    if op.kind == "add":
+        content = "\n".join([*op.added_lines, ""]) if op.added_lines else ""
+        await env.write_file(op.path, content)
+        return f"Added {op.path}"
+
+    if op.kind == "delete":
+        await env.remove_file(op.path)
+        return f"Deleted {op.path}"
+
+    content = await env.read_file(op.path)
+    file_lines = content.splitlines()
+
+    # file_lines is our own list, so splice each hunk in place
+    # rather than copying the whole file per hunk.
+    for hunk in op.hunks:
+        start, end, new_lines = _hunk_splice(file_lines, hunk)
+        file_lines[start:end] = new_lines
+
+    # A trailing empty element yields the final newline from the
+    # join itself, instead of copying the whole text to append it.
+    if file_lines:
+        file_lines.append("")
+    new_content = "\n".join(file_lines)
+
+    target_path = op.move_to or op.path
+    await env.write_file(target_path, new_content)
+
+    if op.move_to and op.move_to != op.path:
+        await env.remove_file(op.path)
+        return f"Updated and moved {op.path} → {op.move_to}"
+    return f"Updated {op.path}"
 
 
 def make_apply_patch_tool(env: ExecutionEnvironment) -> ToolDefinition:
@@ -15,6 +15,11 @@ class RegisteredTool:
 
     definition: ToolDefinition
     executor: Callable[..., Any]
+    is_coro: bool = field(init=False)
+
+    def __post_init__(self) -> None:
+        # Resolved once here rather than on every execute()
+        self.is_coro = inspect.iscoroutinefunction(self.executor)
 
 
 class ToolRegistry:
@@ -22,6 +27,12 @@ class ToolRegistry:
 
     def __init__(self) -> None:
         self._tools: dict[str, RegisteredTool] = {}
+        self._version = 0
+
+    @property
+    def version(self) -> int:
+        """Counter bumped on every change, for caches derived from the tool set."""
+        return self._version
 
     def register(
         self,
@@ -32,10 +43,14 @@ class ToolRegistry:
         self._tools[definition.name] = RegisteredTool(
             definition=definition, executor=executor
         )
+        self._version += 1
 
     def unregister(self, name: str) -> bool:
         """Remove a tool. Returns True if it existed."""
-        return self._tools.pop(name, None) is not None
+        if self._tools.pop(name, None) is None:
+            return False
+        self._version += 1
+        return True
 
     def get(self, name: str) -> RegisteredTool | None:
         """Get a registered tool by name."""
@@ -59,7 +74,7 @@ class ToolRegistry:
                 is_error=True,
             )
         try:
-            if inspect.iscoroutinefunction(tool.executor):
+            if tool.is_coro:
                 result = await tool.executor(**arguments)
             else:
                 result = tool.executor(**arguments)
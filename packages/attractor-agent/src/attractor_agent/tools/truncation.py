@@ -36,6 +36,11 @@ class TruncationResult:
     original_lines: int
 
 
+def _count_lines(text: str) -> int:
+    """Number of lines, counting an unterminated last line."""
+    return text.count("\n") + (1 if text and not text.endswith("\n") else 0)
+
+
 def truncate_chars(text: str, limit: int, mode: str = "head_tail") -> str:
     """Truncate text by character count.
 
@@ -60,17 +65,33 @@ def truncate_chars(text: str, limit: int, mode: str = "head_tail") -> str:
     )
 
 
-def truncate_lines(text: str, limit: int) -> str:
-    """Truncate text by line count, keeping head and tail."""
-    lines = text.splitlines(keepends=True)
-    if len(lines) <= limit:
-        return text
+def split_head_tail(text: str, limit: int) -> tuple[str, str, int] | None:
+    """Split text into the head and tail lines kept by line truncation.
+
+    Returns ``(head, tail, removed)``, or None if the text fits in
+    ``limit`` lines. Only the kept lines are scanned.
+    """
+    total = _count_lines(text)
+    if total <= limit:
+        return None
 
     head_count = limit // 2
     tail_count = limit - head_count
-    removed = len(lines) - limit
-    head = "".join(lines[:head_count])
-    tail = "".join(lines[-tail_count:])
+    head_end = 0
+    for _ in range(head_count):
+        head_end = text.find("\n", head_end) + 1
+    tail_start = len(text) - 1 if text.endswith("\n") else len(text)
+    for _ in range(tail_count):
+        tail_start = text.rfind("\n", 0, tail_start)
+    return text[:head_end], text[tail_start + 1:], total - limit
+
+
+def truncate_lines(text: str, limit: int) -> str:
+    """Truncate text by line count, keeping head and tail."""
+    split = split_head_tail(text, limit)
+    if split is None:
+        return text
+    head, tail, removed = split
     return head + f"\n... [truncated {removed} lines] ...\n" + tail
 
 
@@ -91,7 +112,7 @@ def truncate_output(
         char_mode: Character truncation mode ('head_tail' or 'tail').
     """
     original_chars = len(text)
-    original_lines = text.count("\n") + (1 if text and not text.endswith("\n") else 0)
+    original_lines = _count_lines(text)
 
     max_chars = char_limit if char_limit is not None else CHAR_LIMITS.get(tool_name, DEFAULT_CHAR_LIMIT)
     max_lines = line_limit if line_limit is not None else LINE_LIMITS.get(tool_name, DEFAULT_LINE_LIMIT)
@@ -104,8 +125,9 @@ def truncate_output(
         result = truncate_chars(result, max_chars, mode=char_mode)
         was_truncated = True
 
-    # Then line truncation
-    line_count = result.count("\n") + (1 if result and not result.endswith("\n") else 0)
+    # Then line truncation. Untouched text keeps its original count; a
+    # char-truncated result is at most max_chars long, so recounting is cheap.
+    line_count = _count_lines(result) if was_truncated else original_lines
     if line_count > max_lines:
         result = truncate_lines(result, max_lines)
         was_truncated = True
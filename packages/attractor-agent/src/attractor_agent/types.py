@@ -14,7 +14,7 @@ class ExecResult:
     duration_ms: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class DirEntry:
     name: str = ""
     is_dir: bool = False
@@ -50,3 +50,23 @@ from attractor_llm.catalog import ModelInfo, get_model_info, list_models, get_la
 from attractor_llm.client import Client, get_default_client, set_default_client
 from attractor_llm.generate import generate, GenerateResult, StepResult
 from attractor_llm.stream import stream, StreamAccumulator, StreamResult
+
+# Provider adapters, imported on first attribute access (PEP 562) so that
+# unused providers cost nothing at import time
+_LAZY_ADAPTERS: dict[str, str] = {
+    "AnthropicAdapter": "attractor_llm.providers.anthropic",
+    "GeminiAdapter": "attractor_llm.providers.gemini",
+    "OpenAIAdapter": "attractor_llm.providers.openai",
+    "OpenAICompatibleAdapter": "attractor_llm.providers.openai_compat",
+}
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_ADAPTERS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
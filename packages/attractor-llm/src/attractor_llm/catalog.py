@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
+from types import MappingProxyType
 
 
 @dataclass
@@ -99,24 +100,41 @@ MODELS: list[ModelInfo] = [
     ),
 ]
 
-# Build lookup indices
-_BY_ID: dict[str, ModelInfo] = {m.id: m for m in MODELS}
-_BY_ALIAS: dict[str, ModelInfo] = {}
-for _m in MODELS:
-    for _a in _m.aliases:
-        _BY_ALIAS[_a] = _m
+# Capability names accepted by get_latest_model, and the flag each checks
+_CAPABILITIES: dict[str, str] = {
+    "reasoning": "supports_reasoning",
+    "vision": "supports_vision",
+    "tools": "supports_tools",
+}
+
+# Lookup indices, built once at import. IDs win over aliases on collision.
+_BY_NAME: MappingProxyType[str, ModelInfo] = MappingProxyType({
+    **{a: m for m in MODELS for a in m.aliases},
+    **{m.id: m for m in MODELS},
+})
+_BY_PROVIDER: MappingProxyType[str, tuple[ModelInfo, ...]] = MappingProxyType({
+    p: tuple(m for m in MODELS if m.provider == p)
+    for p in dict.fromkeys(m.provider for m in MODELS)
+})
+# Newest model per (provider, capability); capability None means any model
+_LATEST: MappingProxyType[tuple[str, str | None], ModelInfo] = MappingProxyType({
+    (p, cap): matches[0]
+    for p, models in _BY_PROVIDER.items()
+    for cap in (None, *_CAPABILITIES)
+    if (matches := [m for m in models if cap is None or getattr(m, _CAPABILITIES[cap])])
+})
 
 
 def get_model_info(model_id: str) -> ModelInfo | None:
     """Look up a model by ID or alias. Returns None if unknown."""
-    return _BY_ID.get(model_id) or _BY_ALIAS.get(model_id)
+    return _BY_NAME.get(model_id)
 
 
 def list_models(provider: str | None = None) -> list[ModelInfo]:
     """List all known models, optionally filtered by provider."""
     if provider is None:
         return list(MODELS)
-    return [m for m in MODELS if m.provider == provider]
+    return list(_BY_PROVIDER.get(provider, ()))
 
 
 def get_latest_model(
@@ -126,11 +144,6 @@ def get_latest_model(
 
     Optionally filter by capability: "reasoning", "vision", "tools".
     """
-    candidates = [m for m in MODELS if m.provider == provider]
-    if capability == "reasoning":
-        candidates = [m for m in candidates if m.supports_reasoning]
-    elif capability == "vision":
-        candidates = [m for m in candidates if m.supports_vision]
-    elif capability == "tools":
-        candidates = [m for m in candidates if m.supports_tools]
-    return candidates[0] if candidates else None
+    if capability not in _CAPABILITIES:
+        capability = None
+    return _LATEST.get((provider, capability))
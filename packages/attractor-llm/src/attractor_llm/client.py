@@ -2,15 +2,30 @@
 
 from __future__ import annotations
 
+import asyncio
+import functools
 import os
+from types import MappingProxyType
 from typing import Any, AsyncIterator
 
 from attractor_llm.errors import ConfigurationError
 from attractor_llm.middleware import MiddlewareChain
 from attractor_llm.types import Request, Response, StreamEvent
 
-# Lazy-initialized module-level default client
-_default_client: Client | None = None
+# Client installed by set_default_client; otherwise one is built from the
+# environment on first use
+_default_client_override: Client | None = None
+
+# Providers detected by Client.from_env: (name, API key variables in
+# preference order, base URL variable, default base URL, adapter export)
+_PROVIDER_SPECS: tuple[tuple[str, tuple[str, ...], str, str, str], ...] = (
+    ("openai", ("OPENAI_API_KEY",), "OPENAI_BASE_URL",
+     "https://api.openai.com", "OpenAIAdapter"),
+    ("anthropic", ("ANTHROPIC_API_KEY",), "ANTHROPIC_BASE_URL",
+     "https://api.anthropic.com", "AnthropicAdapter"),
+    ("gemini", ("GEMINI_API_KEY", "GOOGLE_API_KEY"), "GEMINI_BASE_URL",
+     "https://generativelanguage.googleapis.com", "GeminiAdapter"),
+)
 
 
 class Client:
@@ -25,12 +40,18 @@ class Client:
             raise ConfigurationError("At least one provider must be configured")
 
         self._providers = providers
+        # Read-only view handed out by the providers property, no copy per access
+        self._providers_view = MappingProxyType(providers)
         self._default_provider = default_provider or next(iter(providers))
         self._middleware = MiddlewareChain()
+        # Stream handlers keyed by provider name (adapters need not be
+        # hashable), built once so the middleware chain cache sees the same
+        # handler on every call
+        self._stream_handlers: dict[str, tuple[Any, Any]] = {}
 
     @property
-    def providers(self) -> dict[str, Any]:
-        return dict(self._providers)
+    def providers(self) -> MappingProxyType[str, Any]:
+        return self._providers_view
 
     @property
     def default_provider(self) -> str:
@@ -39,25 +60,18 @@ class Client:
     @classmethod
     def from_env(cls) -> Client:
         """Auto-detect providers from environment variables."""
-        providers: dict[str, Any] = {}
-
-        openai_key = os.environ.get("OPENAI_API_KEY")
-        if openai_key:
-            from attractor_llm.providers.openai import OpenAIAdapter
-            base_url = os.environ.get("OPENAI_BASE_URL", "https://api.openai.com")
-            providers["openai"] = OpenAIAdapter(api_key=openai_key, base_url=base_url)
+        import attractor_llm
 
-        anthropic_key = os.environ.get("ANTHROPIC_API_KEY")
-        if anthropic_key:
-            from attractor_llm.providers.anthropic import AnthropicAdapter
-            base_url = os.environ.get("ANTHROPIC_BASE_URL", "https://api.anthropic.com")
-            providers["anthropic"] = AnthropicAdapter(api_key=anthropic_key, base_url=base_url)
-
-        gemini_key = os.environ.get("GEMINI_API_KEY") or os.environ.get("GOOGLE_API_KEY")
-        if gemini_key:
-            from attractor_llm.providers.gemini import GeminiAdapter
-            base_url = os.environ.get("GEMINI_BASE_URL", "https://generativelanguage.googleapis.com")
-            providers["gemini"] = GeminiAdapter(api_key=gemini_key, base_url=base_url)
+        environ = os.environ
+        providers: dict[str, Any] = {}
+        for name, key_envs, base_env, base_default, adapter_name in _PROVIDER_SPECS:
+            api_key = next(filter(None, map(environ.get, key_envs)), None)
+            if not api_key:
+                continue
+            adapter_cls = getattr(attractor_llm, adapter_name)
+            providers[name] = adapter_cls(
+                api_key=api_key, base_url=environ.get(base_env, base_default)
+            )
 
         if not providers:
             raise ConfigurationError(
@@ -77,45 +91,69 @@ class Client:
     async def complete(self, request: Request) -> Response:
         """Send a request and return the full response."""
         adapter = self._resolve_adapter(request)
-
-        async def handler(req: Request) -> Response:
-            return await adapter.complete(req)
-
-        return await self._middleware.apply_complete(request, handler)
+        return await self._middleware.apply_complete(request, adapter.complete)
 
     async def stream(self, request: Request) -> AsyncIterator[StreamEvent]:
         """Send a request and return an async iterator of stream events."""
-        adapter = self._resolve_adapter(request)
+        provider = self._resolve_provider(request)
+        return await self._middleware.apply_stream(request, self._stream_handler(provider))
+
+    async def close(self) -> None:
+        """Close all provider adapters concurrently.
+
+        Every adapter is closed even if one fails; the first failure is
+        then re-raised.
+        """
+        results = await asyncio.gather(
+            *(adapter.close() for adapter in self._providers.values()),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+
+    def _stream_handler(self, provider: str) -> Any:
+        """Awaitable wrapper around the provider adapter's stream, one per provider.
+
+        The cached handler is rebuilt if the adapter registered under the
+        provider name has been replaced since it was created.
+        """
+        adapter = self._providers[provider]
+        cached = self._stream_handlers.get(provider)
+        if cached is not None and cached[0] is adapter:
+            return cached[1]
 
         async def handler(req: Request) -> AsyncIterator[StreamEvent]:
             return adapter.stream(req)
 
-        return await self._middleware.apply_stream(request, handler)
+        self._stream_handlers[provider] = (adapter, handler)
+        return handler
 
-    async def close(self) -> None:
-        """Close all provider adapters."""
-        for adapter in self._providers.values():
-            await adapter.close()
-
-    def _resolve_adapter(self, request: Request) -> Any:
+    def _resolve_provider(self, request: Request) -> str:
         provider = request.provider or self._default_provider
         if provider not in self._providers:
             raise ConfigurationError(
                 f"Provider '{provider}' not configured. "
                 f"Available: {list(self._providers.keys())}"
             )
-        return self._providers[provider]
+        return provider
+
+    def _resolve_adapter(self, request: Request) -> Any:
+        return self._providers[self._resolve_provider(request)]
+
+
+@functools.cache
+def _default_client() -> Client:
+    return _default_client_override or Client.from_env()
 
 
 def get_default_client() -> Client:
     """Get or lazily initialize the module-level default client."""
-    global _default_client
-    if _default_client is None:
-        _default_client = Client.from_env()
-    return _default_client
+    return _default_client()
 
 
 def set_default_client(client: Client) -> None:
     """Override the module-level default client."""
-    global _default_client
-    _default_client = client
+    global _default_client_override
+    _default_client_override = client
+    _default_client.cache_clear()
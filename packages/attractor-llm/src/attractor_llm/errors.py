@@ -2,23 +2,30 @@
 
 from __future__ import annotations
 
+import re
 from typing import Any
 
 
 class SDKError(Exception):
     """Base error for all library errors."""
 
+    retryable: bool = False
+
     def __init__(self, message: str, *, cause: Exception | None = None):
         super().__init__(message)
         self.cause = cause
 
-    @property
-    def retryable(self) -> bool:
-        return False
-
 
 class ProviderError(SDKError):
-    """Error returned by an LLM provider."""
+    """Error returned by an LLM provider.
+
+    Subclasses pin their status code and retryability as class attributes
+    and inherit this constructor, so raising one passes straight through
+    without re-packing keyword arguments.
+    """
+
+    status_code: int | None = None
+    retryable = True
 
     def __init__(
         self,
@@ -27,79 +34,71 @@ class ProviderError(SDKError):
         provider: str,
         status_code: int | None = None,
         error_code: str | None = None,
-        retryable: bool = True,
+        retryable: bool | None = None,
         retry_after: float | None = None,
         raw: dict[str, Any] | None = None,
         cause: Exception | None = None,
     ):
         super().__init__(message, cause=cause)
         self.provider = provider
-        self.status_code = status_code
+        if status_code is not None:
+            self.status_code = status_code
         self.error_code = error_code
-        self._retryable = retryable
+        if retryable is not None:
+            self.retryable = retryable
         self.retry_after = retry_after
         self.raw = raw
 
-    @property
-    def retryable(self) -> bool:
-        return self._retryable
-
 
 # Non-retryable provider errors
 
 class AuthenticationError(ProviderError):
-    def __init__(self, message: str, *, provider: str, **kwargs: Any):
-        super().__init__(message, provider=provider, retryable=False, status_code=401, **kwargs)
+    status_code = 401
+    retryable = False
 
 
 class AccessDeniedError(ProviderError):
-    def __init__(self, message: str, *, provider: str, **kwargs: Any):
-        super().__init__(message, provider=provider, retryable=False, status_code=403, **kwargs)
+    status_code = 403
+    retryable = False
 
 
 class NotFoundError(ProviderError):
-    def __init__(self, message: str, *, provider: str, **kwargs: Any):
-        super().__init__(message, provider=provider, retryable=False, status_code=404, **kwargs)
+    status_code = 404
+    retryable = False
 
 
 class InvalidRequestError(ProviderError):
-    def __init__(self, message: str, *, provider: str, **kwargs: Any):
-        super().__init__(message, provider=provider, retryable=False, status_code=400, **kwargs)
+    status_code = 400
+    retryable = False
 
 
 class ContentFilterError(ProviderError):
-    def __init__(self, message: str, *, provider: str, **kwargs: Any):
-        super().__init__(message, provider=provider, retryable=False, **kwargs)
+    retryable = False
 
 
 class ContextLengthError(ProviderError):
-    def __init__(self, message: str, *, provider: str, **kwargs: Any):
-        super().__init__(message, provider=provider, retryable=False, status_code=413, **kwargs)
+    status_code = 413
+    retryable = False
 
 
 class QuotaExceededError(ProviderError):
-    def __init__(self, message: str, *, provider: str, **kwargs: Any):
-        super().__init__(message, provider=provider, retryable=False, **kwargs)
+    retryable = False
 
 
 # Retryable provider errors
 
 class RateLimitError(ProviderError):
-    def __init__(self, message: str, *, provider: str, **kwargs: Any):
-        super().__init__(message, provider=provider, retryable=True, status_code=429, **kwargs)
+    status_code = 429
 
 
 class ServerError(ProviderError):
-    def __init__(self, message: str, *, provider: str, **kwargs: Any):
-        super().__init__(message, provider=provider, retryable=True, **kwargs)
+    pass
 
 
 # Non-provider errors
 
 class RequestTimeoutError(SDKError):
-    @property
-    def retryable(self) -> bool:
-        return True
+    retryable = True
 
 
 class AbortError(SDKError):
@@ -107,15 +106,11 @@ class AbortError(SDKError):
 
 
 class NetworkError(SDKError):
-    @property
-    def retryable(self) -> bool:
-        return True
+    retryable = True
 
 
 class StreamError(SDKError):
-    @property
-    def retryable(self) -> bool:
-        return True
+    retryable = True
 
 
 class InvalidToolCallError(SDKError):
@@ -130,15 +125,33 @@ class ConfigurationError(SDKError):
     pass
 
 
+# Message phrases per category, in priority order (earlier categories win)
+_MESSAGE_CATEGORIES: tuple[tuple[str, tuple[str, ...]], ...] = (
+    ("not_found", ("not found", "does not exist")),
+    ("authentication", ("unauthorized", "invalid key")),
+    ("context_length", ("context length", "too many tokens")),
+    ("content_filter", ("content filter", "safety")),
+)
+_PHRASE_RANK: dict[str, int] = {
+    phrase: rank
+    for rank, (_, phrases) in enumerate(_MESSAGE_CATEGORIES)
+    for phrase in phrases
+}
+# ASCII-only case folding: the phrases are ASCII, and full Unicode folding
+# would also match variants like a long-s "safety" that are not table keys
+_PHRASE_RE = re.compile(
+    "|".join(re.escape(phrase) for phrase in _PHRASE_RANK),
+    re.IGNORECASE | re.ASCII,
+)
+
+
 def classify_error_message(message: str) -> str | None:
     """Classify an error message for ambiguous HTTP status codes."""
-    msg = message.lower()
-    if "not found" in msg or "does not exist" in msg:
-        return "not_found"
-    if "unauthorized" in msg or "invalid key" in msg:
-        return "authentication"
-    if "context length" in msg or "too many tokens" in msg:
-        return "context_length"
-    if "content filter" in msg or "safety" in msg:
-        return "content_filter"
-    return None
+    best: int | None = None
+    for match in _PHRASE_RE.finditer(message):
+        rank = _PHRASE_RANK[match.group().lower()]
+        if best is None or rank < best:
+            best = rank
+            if rank == 0:
+                break
+    return _MESSAGE_CATEGORIES[best][0] if best is not None else None
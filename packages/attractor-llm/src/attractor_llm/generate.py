@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import asyncio
+import functools
 import inspect
 import json
 from dataclasses import dataclass, field
@@ -28,7 +29,7 @@ from attractor_llm.types import (
 )
 
 
-@dataclass
+@dataclass(slots=True)
 class StepResult:
     text: str = ""
     reasoning: str | None = None
@@ -40,7 +41,7 @@ class StepResult:
     warnings: list[Warning] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class GenerateResult:
     text: str = ""
     reasoning: str | None = None
@@ -93,17 +94,20 @@ async def generate(
 
     # Build tool definitions (without execute handlers) for the request
     tool_defs = tools
-    tool_map: dict[str, Any] = {}
+    # name -> (handler, is_coroutine_function), classified once per tool
+    tool_map: dict[str, tuple[Any, bool]] = {}
     if tools:
         for t in tools:
             if t.execute is not None:
-                tool_map[t.name] = t.execute
+                tool_map[t.name] = (t.execute, inspect.iscoroutinefunction(t.execute))
 
     policy = RetryPolicy(max_retries=max_retries, base_delay=0.5)
     steps: list[StepResult] = []
     total_usage = Usage()
 
     for round_idx in range(max_tool_rounds + 1):
+        # A fresh request per round with a snapshot of the conversation, so
+        # anything holding on to an earlier request never sees it change
         request = Request(
             model=model,
             messages=list(conversation),
@@ -119,8 +123,8 @@ async def generate(
             provider_options=provider_options,
         )
 
-        # Retry-wrapped LLM call
-        resp = await retry(lambda: client.complete(request), policy)
+        # Retry-wrapped LLM call; one bound call serves every attempt
+        resp = await retry(functools.partial(client.complete, request), policy)
 
         step = StepResult(
             text=resp.text,
@@ -132,26 +136,22 @@ async def generate(
             warnings=resp.warnings,
         )
 
-        total_usage = total_usage + resp.usage
+        total_usage += resp.usage
 
         # If there are tool calls and we have active tools, execute them
         if resp.tool_calls and tool_map and round_idx < max_tool_rounds:
+            # Start the tools first so they run while the conversation is
+            # updated, then collect their results
+            tasks = _start_tools(resp.tool_calls, tool_map)
+
             # Append assistant message with tool calls to conversation
             conversation.append(resp.message)
 
-            # Execute tools concurrently
-            tool_results = await _execute_tools(resp.tool_calls, tool_map)
+            tool_results = await asyncio.gather(*tasks)
             step.tool_results = tool_results
 
-            # Append tool results to conversation
-            for tr in tool_results:
-                conversation.append(
-                    Message.tool_result(
-                        tool_call_id=tr.tool_call_id,
-                        content=tr.content,
-                        is_error=tr.is_error,
-                    )
-                )
+            # Append all tool results to conversation as one message
+            conversation.append(Message.tool_results(tool_results))
 
             steps.append(step)
             continue
@@ -174,22 +174,27 @@ async def generate(
     )
 
 
-async def _execute_tools(
+def _start_tools(
     tool_calls: list[ToolCall],
-    tool_map: dict[str, Any],
-) -> list[ToolResult]:
-    """Execute tool calls concurrently."""
+    tool_map: dict[str, tuple[Any, bool]],
+) -> list[asyncio.Task[ToolResult]]:
+    """Start executing tool calls concurrently; await the returned tasks.
+
+    Tasks start eagerly: each handler runs up to its first suspension (a
+    sync handler runs to completion) before this function returns.
+    """
 
     async def _run_one(tc: ToolCall) -> ToolResult:
-        handler = tool_map.get(tc.name)
-        if handler is None:
+        entry = tool_map.get(tc.name)
+        if entry is None:
             return ToolResult(
                 tool_call_id=tc.id,
                 content=f"Unknown tool: {tc.name}",
                 is_error=True,
             )
+        handler, is_coro = entry
         try:
-            if inspect.iscoroutinefunction(handler):
+            if is_coro:
                 result = await handler(**tc.arguments)
             else:
                 result = handler(**tc.arguments)
@@ -202,5 +207,7 @@ async def _execute_tools(
                 is_error=True,
             )
 
-    results = await asyncio.gather(*[_run_one(tc) for tc in tool_calls])
-    return list(results)
+    loop = asyncio.get_running_loop()
+    return [
+        asyncio.Task(_run_one(tc), loop=loop, eager_start=True) for tc in tool_calls
+    ]
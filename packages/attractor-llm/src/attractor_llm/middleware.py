@@ -18,21 +18,31 @@ StreamMiddleware = Callable[
     Awaitable[Any],
 ]
 
+# Composed chains cached per handler before the cache is reset
+_MAX_CACHED_CHAINS = 32
+
 
 class MiddlewareChain:
     """Onion/chain-of-responsibility middleware for complete and stream calls."""
 
     def __init__(self) -> None:
-        self._complete_mw: list[CompleteMiddleware] = []
-        self._stream_mw: list[StreamMiddleware] = []
+        # Registered middleware; tuples rebuilt on registration, which is rare
+        # next to the per-request reads
+        self._complete_mw: tuple[CompleteMiddleware, ...] = ()
+        self._stream_mw: tuple[StreamMiddleware, ...] = ()
+        # Wrapped chains keyed by handler; rebuilt only after use()/use_stream()
+        self._complete_chains: dict[Callable[..., Any], Callable[[Request], Awaitable[Response]]] = {}
+        self._stream_chains: dict[Callable[..., Any], Callable[[Request], Awaitable[Any]]] = {}
 
     def use(self, middleware: CompleteMiddleware) -> None:
         """Register middleware for complete() calls."""
-        self._complete_mw.append(middleware)
+        self._complete_mw += (middleware,)
+        self._complete_chains.clear()
 
     def use_stream(self, middleware: StreamMiddleware) -> None:
         """Register middleware for stream() calls."""
-        self._stream_mw.append(middleware)
+        self._stream_mw += (middleware,)
+        self._stream_chains.clear()
 
     async def apply_complete(
         self,
@@ -40,10 +50,15 @@ class MiddlewareChain:
         handler: Callable[[Request], Awaitable[Response]],
     ) -> Response:
         """Apply middleware chain and call handler."""
-        chain = handler
-        # Build from inside out (last registered wraps closest to handler)
-        for mw in reversed(self._complete_mw):
-            chain = _wrap_complete(mw, chain)
+        if not self._complete_mw:
+            return await handler(request)
+        chain = self._complete_chains.get(handler)
+        if chain is None:
+            chain = handler
+            # Build from inside out (last registered wraps closest to handler)
+            for mw in reversed(self._complete_mw):
+                chain = _forward(mw, chain)
+            _cache_chain(self._complete_chains, handler, chain)
         return await chain(request)
 
     async def apply_stream(
@@ -52,25 +67,35 @@ class MiddlewareChain:
         handler: Callable[[Request], Awaitable[Any]],
     ) -> Any:
         """Apply stream middleware chain and call handler."""
-        chain = handler
-        for mw in reversed(self._stream_mw):
-            chain = _wrap_stream(mw, chain)
+        if not self._stream_mw:
+            return await handler(request)
+        chain = self._stream_chains.get(handler)
+        if chain is None:
+            chain = handler
+            for mw in reversed(self._stream_mw):
+                chain = _forward(mw, chain)
+            _cache_chain(self._stream_chains, handler, chain)
         return await chain(request)
 
 
-def _wrap_complete(
-    mw: CompleteMiddleware,
-    next_fn: Callable[[Request], Awaitable[Response]],
-) -> Callable[[Request], Awaitable[Response]]:
-    async def wrapped(request: Request) -> Response:
-        return await mw(request, next_fn)
-    return wrapped
+def _cache_chain(
+    cache: dict[Callable[..., Any], Any],
+    handler: Callable[..., Any],
+    chain: Callable[..., Any],
+) -> None:
+    # Callers that pass a fresh handler each time would otherwise grow the
+    # cache without bound.
+    if len(cache) >= _MAX_CACHED_CHAINS:
+        cache.clear()
+    cache[handler] = chain
 
 
-def _wrap_stream(
-    mw: StreamMiddleware,
+def _forward(
+    mw: Callable[[Request, Callable[[Request], Awaitable[Any]]], Awaitable[Any]],
     next_fn: Callable[[Request], Awaitable[Any]],
 ) -> Callable[[Request], Awaitable[Any]]:
-    async def wrapped(request: Request) -> Any:
-        return await mw(request, next_fn)
-    return wrapped
+    # A plain function handing back the middleware's own awaitable, so a
+    # call through N layers does not stack N extra coroutine frames.
+    def forward(request: Request) -> Awaitable[Any]:
+        return mw(request, next_fn)
+    return forward
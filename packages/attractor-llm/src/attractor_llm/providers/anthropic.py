@@ -2,11 +2,17 @@
 
 from __future__ import annotations
 
+import base64
 import json
-from typing import Any, AsyncIterator
+from typing import Any, AsyncIterator, Callable
 
 import httpx
 
+try:
+    import orjson
+except ImportError:  # optional; stdlib json is the fallback
+    orjson = None
+
 from attractor_llm.errors import (
     AuthenticationError,
     AccessDeniedError,
@@ -50,6 +56,44 @@ _STATUS_MAP: dict[int, type] = {
     504: ServerError,
 }
 
+# JSON codec for bodies, SSE lines and tool arguments: orjson when it is
+# installed, stdlib otherwise. orjson's decode error subclasses
+# json.JSONDecodeError, so callers catch that either way.
+if orjson is not None:
+    _loads = orjson.loads
+
+    def _dumps(obj: Any) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    def _dumps_bytes(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+else:
+    _loads = json.loads
+    _dumps = json.dumps
+
+    def _dumps_bytes(obj: Any) -> bytes:
+        # Same encoding httpx applies for json=
+        return json.dumps(
+            obj, ensure_ascii=False, separators=(",", ":"), allow_nan=False
+        ).encode()
+
+# Tool choice modes the Messages API can express
+_TOOL_CHOICE_MODES = frozenset({"auto", "none", "required", "named"})
+
+# Shared tool_choice payloads for modes without arguments. Plain dicts so
+# the JSON encoders accept them; request building only reads them.
+_STATIC_TOOL_CHOICES: dict[str, dict[str, str]] = {
+    "auto": {"type": "auto"},
+    "required": {"type": "any"},
+}
+
+# Translated tool definitions kept per adapter before the cache is reset
+_MAX_CACHED_TOOLS = 256
+
+# Raw image bytes whose base64 encodings are kept per adapter before the
+# cache is reset; larger images are encoded on every request
+_MAX_CACHED_IMAGE_BYTES = 8 * 1024 * 1024
+
 _FINISH_MAP: dict[str, str] = {
     "end_turn": "stop",
     "stop_sequence": "stop",
@@ -58,6 +102,65 @@ _FINISH_MAP: dict[str, str] = {
 }
 
 
+def _tool_use_block(p: ContentPart) -> dict[str, Any] | None:
+    if not p.tool_call:
+        return None
+    args = p.tool_call.arguments
+    if isinstance(args, str):
+        try:
+            args = _loads(args)
+        except json.JSONDecodeError:
+            args = {}
+    return {
+        "type": "tool_use",
+        "id": p.tool_call.id,
+        "name": p.tool_call.name,
+        "input": args,
+    }
+
+
+def _thinking_block(p: ContentPart) -> dict[str, Any] | None:
+    if not p.thinking:
+        return None
+    block: dict[str, Any] = {"type": "thinking", "thinking": p.thinking.text}
+    if p.thinking.signature:
+        block["signature"] = p.thinking.signature
+    return block
+
+
+def _redacted_thinking_block(p: ContentPart) -> dict[str, Any] | None:
+    if not p.thinking:
+        return None
+    return {"type": "redacted_thinking", "data": p.thinking.text}
+
+
+# Block builders for non-text parts of user/assistant messages; images are
+# built by the adapter, which owns the encoding cache
+_PART_TRANSLATORS: dict[ContentKind, Callable[[ContentPart], dict[str, Any] | None]] = {
+    ContentKind.TOOL_CALL: _tool_use_block,
+    ContentKind.THINKING: _thinking_block,
+    ContentKind.REDACTED_THINKING: _redacted_thinking_block,
+}
+
+
+async def _iter_sse_data(http_resp: httpx.Response) -> AsyncIterator[bytes]:
+    """Yield the payload of each SSE data line as raw bytes.
+
+    Each payload names its own event in "type", so blank lines, ":"
+    comments and "event:" lines are skipped. Lines stay bytes until the
+    JSON parser reads them; a trailing CR is JSON whitespace and left on.
+    """
+    pending = b""
+    async for chunk in http_resp.aiter_bytes():
+        lines = (pending + chunk).split(b"\n")
+        pending = lines.pop()
+        for line in lines:
+            if line[:6] == b"data: ":
+                yield line[6:]
+    if pending[:6] == b"data: ":
+        yield pending[6:]
+
+
 class AnthropicAdapter:
     """Adapter for the Anthropic Messages API (/v1/messages)."""
 
@@ -79,6 +182,17 @@ class AnthropicAdapter:
             },
             timeout=httpx.Timeout(300.0),
         )
+        # Translated tool definitions, reused while the same tools are sent
+        self._tool_cache: dict[int, tuple[Any, dict[str, Any]]] = {}
+        # Base64 encodings of image bytes, and the raw size they cover
+        self._image_cache: dict[bytes, str] = {}
+        self._image_cache_bytes = 0
+        # Bodies are posted pre-encoded, so httpx no longer adds a JSON
+        # content type; send one per request only if the client lacks it
+        self._json_headers: dict[str, str] = (
+            {} if "content-type" in self._client.headers
+            else {"Content-Type": "application/json"}
+        )
 
     @property
     def name(self) -> str:
@@ -87,16 +201,19 @@ class AnthropicAdapter:
     async def complete(self, request: Request) -> Response:
         body, headers = self._build_request(request, stream=False)
         http_resp = await self._client.post(
-            f"{self._base_url}/v1/messages", json=body, headers=headers
+            f"{self._base_url}/v1/messages", content=_dumps_bytes(body), headers=headers
         )
         if http_resp.status_code >= 400:
             self._raise_error(http_resp)
-        return self._parse_response(http_resp.json(), http_resp)
+        return self._parse_response(_loads(http_resp.content), http_resp)
 
     async def stream(self, request: Request) -> AsyncIterator[StreamEvent]:
         body, headers = self._build_request(request, stream=True)
         async with self._client.stream(
-            "POST", f"{self._base_url}/v1/messages", json=body, headers=headers
+            "POST",
+            f"{self._base_url}/v1/messages",
+            content=_dumps_bytes(body),
+            headers=headers,
         ) as http_resp:
             if http_resp.status_code >= 400:
                 await http_resp.aread()
@@ -111,15 +228,16 @@ class AnthropicAdapter:
         pass
 
     def supports_tool_choice(self, mode: str) -> bool:
-        return mode in ("auto", "none", "required", "named")
+        return mode in _TOOL_CHOICE_MODES
 
     # -- Request building --
 
     def _build_request(
         self, request: Request, *, stream: bool
-    ) -> tuple[dict[str, Any], dict[str, str]]:
+    ) -> tuple[dict[str, Any], dict[str, str] | None]:
         body: dict[str, Any] = {"model": request.model}
-        extra_headers: dict[str, str] = {}
+        # None lets httpx skip merging per-request headers into its defaults
+        extra_headers = self._json_headers or None
 
         # Extract system messages
         system_parts, api_messages = self._translate_messages(request.messages)
@@ -150,12 +268,17 @@ class AnthropicAdapter:
 
         # Provider options
         opts = (request.provider_options or {}).get("anthropic", {})
-        beta_headers = opts.pop("beta_headers", None)
+        beta_headers = opts.get("beta_headers")
         if beta_headers:
-            extra_headers["anthropic-beta"] = ",".join(beta_headers)
-        # Apply remaining options
+            extra_headers = {
+                **self._json_headers,
+                "anthropic-beta": ",".join(beta_headers),
+            }
+        # Apply remaining options; the caller's dict is left untouched since
+        # the same request may be sent again
         for k, v in opts.items():
-            body[k] = v
+            if k != "beta_headers":
+                body[k] = v
 
         return body, extra_headers
 
@@ -164,6 +287,8 @@ class AnthropicAdapter:
     ) -> tuple[list[dict[str, Any]] | str, list[dict[str, Any]]]:
         system_parts: list[dict[str, Any]] = []
         api_messages: list[dict[str, Any]] = []
+        last_role: str | None = None
+        last_content: list[dict[str, Any]] = []
 
         for msg in messages:
             if msg.role in (Role.SYSTEM, Role.DEVELOPER):
@@ -172,14 +297,15 @@ class AnthropicAdapter:
                         system_parts.append({"type": "text", "text": p.text})
                 continue
 
+            content_blocks: list[dict[str, Any]] = []
             if msg.role == Role.TOOL:
                 # Tool results go in user messages
-                blocks: list[dict[str, Any]] = []
+                role = "user"
                 for p in msg.content:
                     if p.kind == ContentKind.TOOL_RESULT and p.tool_result:
                         content = p.tool_result.content
                         if isinstance(content, dict):
-                            content = json.dumps(content)
+                            content = _dumps(content)
                         block: dict[str, Any] = {
                             "type": "tool_result",
                             "tool_use_id": p.tool_result.tool_call_id,
@@ -187,97 +313,101 @@ class AnthropicAdapter:
                         }
                         if p.tool_result.is_error:
                             block["is_error"] = True
-                        blocks.append(block)
-                if blocks:
-                    self._append_message(api_messages, "user", blocks)
+                        content_blocks.append(block)
+            else:
+                role = "user" if msg.role == Role.USER else "assistant"
+                for p in msg.content:
+                    # Text dominates, so it skips the table lookup
+                    if p.kind == ContentKind.TEXT:
+                        if p.text is not None:
+                            content_blocks.append({"type": "text", "text": p.text})
+                        continue
+                    if p.kind == ContentKind.IMAGE:
+                        part_block = self._image_block(p)
+                    else:
+                        translate = _PART_TRANSLATORS.get(p.kind)
+                        part_block = translate(p) if translate is not None else None
+                    if part_block is not None:
+                        content_blocks.append(part_block)
+
+            if not content_blocks:
                 continue
-
-            role = "user" if msg.role == Role.USER else "assistant"
-            content_blocks: list[dict[str, Any]] = []
-
-            for p in msg.content:
-                if p.kind == ContentKind.TEXT and p.text is not None:
-                    content_blocks.append({"type": "text", "text": p.text})
-                elif p.kind == ContentKind.TOOL_CALL and p.tool_call:
-                    args = p.tool_call.arguments
-                    if isinstance(args, str):
-                        try:
-                            args = json.loads(args)
-                        except json.JSONDecodeError:
-                            args = {}
-                    content_blocks.append({
-                        "type": "tool_use",
-                        "id": p.tool_call.id,
-                        "name": p.tool_call.name,
-                        "input": args,
-                    })
-                elif p.kind == ContentKind.THINKING and p.thinking:
-                    block = {
-                        "type": "thinking",
-                        "thinking": p.thinking.text,
-                    }
-                    if p.thinking.signature:
-                        block["signature"] = p.thinking.signature
-                    content_blocks.append(block)
-                elif p.kind == ContentKind.REDACTED_THINKING and p.thinking:
-                    content_blocks.append({
-                        "type": "redacted_thinking",
-                        "data": p.thinking.text,
-                    })
-                elif p.kind == ContentKind.IMAGE and p.image:
-                    if p.image.url:
-                        content_blocks.append({
-                            "type": "image",
-                            "source": {"type": "url", "url": p.image.url},
-                        })
-                    elif p.image.data:
-                        import base64
-                        content_blocks.append({
-                            "type": "image",
-                            "source": {
-                                "type": "base64",
-                                "media_type": p.image.media_type or "image/png",
-                                "data": base64.b64encode(p.image.data).decode(),
-                            },
-                        })
-
-            if content_blocks:
-                self._append_message(api_messages, role, content_blocks)
+            # Merge runs of the same role (strict alternation)
+            if role == last_role:
+                last_content.extend(content_blocks)
+            else:
+                api_messages.append({"role": role, "content": content_blocks})
+                last_role, last_content = role, content_blocks
 
         # Return system as string if single text, else as list
         if len(system_parts) == 1 and system_parts[0].get("type") == "text":
             return system_parts[0]["text"], api_messages
         return system_parts if system_parts else "", api_messages
 
-    def _append_message(
-        self,
-        messages: list[dict[str, Any]],
-        role: str,
-        content: list[dict[str, Any]],
-    ) -> None:
-        """Append message, merging with previous if same role (strict alternation)."""
-        if messages and messages[-1]["role"] == role:
-            messages[-1]["content"].extend(content)
-        else:
-            messages.append({"role": role, "content": content})
+    def _image_block(self, p: ContentPart) -> dict[str, Any] | None:
+        if not p.image:
+            return None
+        if p.image.url:
+            return {"type": "image", "source": {"type": "url", "url": p.image.url}}
+        data = p.image.data
+        if data:
+            return {
+                "type": "image",
+                "source": {
+                    "type": "base64",
+                    "media_type": p.image.media_type or "image/png",
+                    "data": self._encode_image(data),
+                },
+            }
+        return None
+
+    def _encode_image(self, data: bytes | bytearray) -> str:
+        # Images are resent with every later turn of a conversation. bytes
+        # caches its own hash, so a repeat lookup costs no pass over the
+        # data; only immutable bytes can key the cache.
+        if not isinstance(data, bytes):
+            return base64.b64encode(data).decode()
+        encoded = self._image_cache.get(data)
+        if encoded is not None:
+            return encoded
+        encoded = base64.b64encode(data).decode()
+        if len(data) <= _MAX_CACHED_IMAGE_BYTES:
+            if self._image_cache_bytes + len(data) > _MAX_CACHED_IMAGE_BYTES:
+                self._image_cache.clear()
+                self._image_cache_bytes = 0
+            self._image_cache[data] = encoded
+            self._image_cache_bytes += len(data)
+        return encoded
 
     def _translate_tool(self, tool: Any) -> dict[str, Any]:
-        return {
+        # Keyed by id(); the entry keeps the tool alive so the id stays its
+        # own, and the field identity checks catch tools edited in place
+        cached = self._tool_cache.get(id(tool))
+        if cached is not None:
+            owner, translated = cached
+            if (
+                owner is tool
+                and translated["name"] is tool.name
+                and translated["description"] is tool.description
+                and translated["input_schema"] is tool.parameters
+            ):
+                return translated
+        translated = {
             "name": tool.name,
             "description": tool.description,
             "input_schema": tool.parameters,
         }
+        if len(self._tool_cache) >= _MAX_CACHED_TOOLS:
+            self._tool_cache.clear()
+        self._tool_cache[id(tool)] = (tool, translated)
+        return translated
 
     def _translate_tool_choice(self, tc: Any) -> dict[str, Any] | None:
-        if tc.mode == "auto":
-            return {"type": "auto"}
-        if tc.mode == "none":
-            return None  # Omit tools entirely
-        if tc.mode == "required":
-            return {"type": "any"}
         if tc.mode == "named":
             return {"type": "tool", "name": tc.tool_name}
-        return {"type": "auto"}
+        if tc.mode == "none":
+            return None  # Omit tools entirely
+        return _STATIC_TOOL_CHOICES.get(tc.mode, _STATIC_TOOL_CHOICES["auto"])
 
     # -- Response parsing --
 
@@ -285,15 +415,17 @@ class AnthropicAdapter:
         self, data: dict[str, Any], http_resp: httpx.Response | None = None
     ) -> Response:
         content_parts: list[ContentPart] = []
+        append = content_parts.append
 
-        for block in data.get("content", []):
+        # Branches are ordered by how often each block type appears
+        for block in data.get("content", ()):
             block_type = block.get("type", "")
             if block_type == "text":
-                content_parts.append(
+                append(
                     ContentPart(kind=ContentKind.TEXT, text=block.get("text", ""))
                 )
             elif block_type == "tool_use":
-                content_parts.append(
+                append(
                     ContentPart(
                         kind=ContentKind.TOOL_CALL,
                         tool_call=ToolCallData(
@@ -304,7 +436,7 @@ class AnthropicAdapter:
                     )
                 )
             elif block_type == "thinking":
-                content_parts.append(
+                append(
                     ContentPart(
                         kind=ContentKind.THINKING,
                         thinking=ThinkingData(
@@ -315,7 +447,7 @@ class AnthropicAdapter:
                     )
                 )
             elif block_type == "redacted_thinking":
-                content_parts.append(
+                append(
                     ContentPart(
                         kind=ContentKind.REDACTED_THINKING,
                         thinking=ThinkingData(
@@ -359,22 +491,19 @@ class AnthropicAdapter:
         )
 
     def _parse_rate_limit(self, headers: httpx.Headers) -> RateLimitInfo | None:
-        def _int(key: str) -> int | None:
-            v = headers.get(key)
-            return int(v) if v else None
-
-        rli = RateLimitInfo(
-            requests_remaining=_int("anthropic-ratelimit-requests-remaining"),
-            requests_limit=_int("anthropic-ratelimit-requests-limit"),
-            tokens_remaining=_int("anthropic-ratelimit-tokens-remaining"),
-            tokens_limit=_int("anthropic-ratelimit-tokens-limit"),
+        get = headers.get
+        requests_remaining = get("anthropic-ratelimit-requests-remaining")
+        requests_limit = get("anthropic-ratelimit-requests-limit")
+        tokens_remaining = get("anthropic-ratelimit-tokens-remaining")
+        tokens_limit = get("anthropic-ratelimit-tokens-limit")
+        if not (requests_remaining or requests_limit or tokens_remaining or tokens_limit):
+            return None
+        return RateLimitInfo(
+            requests_remaining=int(requests_remaining) if requests_remaining else None,
+            requests_limit=int(requests_limit) if requests_limit else None,
+            tokens_remaining=int(tokens_remaining) if tokens_remaining else None,
+            tokens_limit=int(tokens_limit) if tokens_limit else None,
         )
-        if any(
-            v is not None
-            for v in (rli.requests_remaining, rli.requests_limit, rli.tokens_remaining, rli.tokens_limit)
-        ):
-            return rli
-        return None
 
     # -- Streaming --
 
@@ -387,18 +516,11 @@ class AnthropicAdapter:
         accumulated_args: str = ""
         input_tokens = 0
         output_tokens = 0
+        stop_reason = "end_turn"
 
-        async for line in http_resp.aiter_lines():
-            if not line or line.startswith(":"):
-                continue
-            if line.startswith("event: "):
-                event_type = line[7:].strip()
-                continue
-            if not line.startswith("data: "):
-                continue
-
+        async for payload in _iter_sse_data(http_resp):
             try:
-                data = json.loads(line[6:])
+                data = _loads(payload)
             except json.JSONDecodeError:
                 continue
 
@@ -458,7 +580,7 @@ class AnthropicAdapter:
                     yield StreamEvent(type=StreamEventType.TEXT_END)
                 elif current_block_type == "tool_use":
                     try:
-                        args = json.loads(accumulated_args) if accumulated_args else {}
+                        args = _loads(accumulated_args) if accumulated_args else {}
                     except json.JSONDecodeError:
                         args = {}
                     yield StreamEvent(
@@ -474,16 +596,16 @@ class AnthropicAdapter:
                 current_block_type = None
 
             elif msg_type == "message_delta":
-                delta = data.get("delta", {})
-                usage = data.get("usage", {})
-                output_tokens = usage.get("output_tokens", 0)
-                raw_reason = delta.get("stop_reason", "end_turn")
-                reason = _FINISH_MAP.get(raw_reason, "other")
-                # Don't yield FINISH here, wait for message_stop
+                # Only record here; FINISH is emitted on message_stop
+                output_tokens = data.get("usage", {}).get("output_tokens", 0)
+                stop_reason = data.get("delta", {}).get("stop_reason") or stop_reason
 
             elif msg_type == "message_stop":
                 yield StreamEvent(
                     type=StreamEventType.FINISH,
+                    finish_reason=FinishReason(
+                        reason=_FINISH_MAP.get(stop_reason, "other"), raw=stop_reason
+                    ),
                     usage=Usage(
                         input_tokens=input_tokens,
                         output_tokens=output_tokens,
@@ -495,7 +617,7 @@ class AnthropicAdapter:
 
     def _raise_error(self, http_resp: httpx.Response) -> None:
         try:
-            body = http_resp.json()
+            body = _loads(http_resp.content)
         except Exception:
             body = {"error": {"message": http_resp.text}}
 
@@ -116,7 +116,14 @@ class OpenAICompatibleAdapter:
     def _build_request_body(self, request: Request, *, stream: bool) -> dict[str, Any]:
         body: dict[str, Any] = {"model": request.model}
 
-        body["messages"] = [self._translate_message(m) for m in request.messages]
+        messages: list[dict[str, Any]] = []
+        for m in request.messages:
+            if m.role == Role.TOOL:
+                # Chat Completions wants one tool message per result
+                messages.extend(self._translate_tool_results(m))
+            else:
+                messages.append(self._translate_message(m))
+        body["messages"] = messages
 
         if stream:
             body["stream"] = True
@@ -166,6 +173,20 @@ class OpenAICompatibleAdapter:
 
         return body
 
+    def _translate_tool_results(self, msg: Message) -> list[dict[str, Any]]:
+        results: list[dict[str, Any]] = []
+        for p in msg.content:
+            if p.kind == ContentKind.TOOL_RESULT and p.tool_result:
+                content = p.tool_result.content
+                if not isinstance(content, str):
+                    content = json.dumps(content)
+                results.append({
+                    "role": "tool",
+                    "tool_call_id": p.tool_result.tool_call_id,
+                    "content": content,
+                })
+        return results
+
     def _translate_message(self, msg: Message) -> dict[str, Any]:
         if msg.role == Role.SYSTEM:
             return {"role": "system", "content": msg.text}
@@ -174,17 +195,8 @@ class OpenAICompatibleAdapter:
         if msg.role == Role.USER:
             return {"role": "user", "content": msg.text}
         if msg.role == Role.TOOL:
-            for p in msg.content:
-                if p.kind == ContentKind.TOOL_RESULT and p.tool_result:
-                    content = p.tool_result.content
-                    if not isinstance(content, str):
-                        content = json.dumps(content)
-                    return {
-                        "role": "tool",
-                        "tool_call_id": p.tool_result.tool_call_id,
-                        "content": content,
-                    }
-            return {"role": "tool", "content": ""}
+            results = self._translate_tool_results(msg)
+            return results[0] if results else {"role": "tool", "content": ""}
         # ASSISTANT
         result: dict[str, Any] = {"role": "assistant"}
         text_parts = [p.text for p in msg.content if p.kind == ContentKind.TEXT and p.text]
@@ -65,7 +65,7 @@ class DocumentData:
     file_name: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ToolCallData:
     id: str = ""
     name: str = ""
@@ -82,14 +82,14 @@ class ToolResultData:
     image_media_type: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ThinkingData:
     text: str = ""
     signature: str | None = None
     redacted: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class ContentPart:
     kind: ContentKind | str = ContentKind.TEXT
     text: str | None = None
@@ -157,6 +157,25 @@ class Message:
             tool_call_id=tool_call_id,
         )
 
+    @classmethod
+    def tool_results(cls, results: list[ToolResult]) -> Message:
+        """One tool-role message carrying every result from a round."""
+        return cls(
+            role=Role.TOOL,
+            content=[
+                ContentPart(
+                    kind=ContentKind.TOOL_RESULT,
+                    tool_result=ToolResultData(
+                        tool_call_id=r.tool_call_id,
+                        content=r.content,
+                        is_error=r.is_error,
+                    ),
+                )
+                for r in results
+            ],
+            tool_call_id=results[0].tool_call_id if len(results) == 1 else None,
+        )
+
 
 @dataclass
 class ToolChoice:
@@ -188,13 +207,13 @@ class Request:
     provider_options: dict[str, Any] | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class FinishReason:
     reason: str = "stop"
     raw: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Usage:
     input_tokens: int = 0
     output_tokens: int = 0
@@ -205,11 +224,6 @@ class Usage:
     raw: dict[str, Any] | None = None
 
     def __add__(self, other: Usage) -> Usage:
-        def _add_optional(a: int | None, b: int | None) -> int | None:
-            if a is None and b is None:
-                return None
-            return (a or 0) + (b or 0)
-
         return Usage(
             input_tokens=self.input_tokens + other.input_tokens,
             output_tokens=self.output_tokens + other.output_tokens,
@@ -219,6 +233,23 @@ class Usage:
             cache_write_tokens=_add_optional(self.cache_write_tokens, other.cache_write_tokens),
         )
 
+    def __iadd__(self, other: Usage) -> Usage:
+        """Accumulate in place; like +, the result carries no raw payload."""
+        self.input_tokens += other.input_tokens
+        self.output_tokens += other.output_tokens
+        self.total_tokens += other.total_tokens
+        self.reasoning_tokens = _add_optional(self.reasoning_tokens, other.reasoning_tokens)
+        self.cache_read_tokens = _add_optional(self.cache_read_tokens, other.cache_read_tokens)
+        self.cache_write_tokens = _add_optional(self.cache_write_tokens, other.cache_write_tokens)
+        self.raw = None
+        return self
+
+
+def _add_optional(a: int | None, b: int | None) -> int | None:
+    if a is None and b is None:
+        return None
+    return (a or 0) + (b or 0)
+
 
 @dataclass
 class Warning:
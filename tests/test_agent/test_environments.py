@@ -1,5 +1,6 @@
 """Tests for execution environments."""
 
+import asyncio
 import os
 import platform
 
@@ -32,6 +33,18 @@ class TestLocalExecutionEnvironment:
         content = await tmp_env.read_file("data.txt", offset=2, limit=2)
         assert content == "b\nc\n"
 
+    async def test_read_file_offset_or_limit_only(self, tmp_env, tmp_path):
+        await tmp_env.write_file("data.txt", "a\nb\nc\nd")
+        assert await tmp_env.read_file("data.txt", offset=3) == "c\nd"
+        assert await tmp_env.read_file("data.txt", limit=2) == "a\nb\n"
+        assert await tmp_env.read_file("data.txt", offset=10) == ""
+
+    async def test_read_file_negative_offset_limit_clamped(self, tmp_env, tmp_path):
+        await tmp_env.write_file("data.txt", "a\nb\nc\nd")
+        assert await tmp_env.read_file("data.txt", offset=-1) == "a\nb\nc\nd"
+        assert await tmp_env.read_file("data.txt", offset=-5, limit=2) == "a\nb\n"
+        assert await tmp_env.read_file("data.txt", offset=2, limit=-1) == ""
+
     async def test_write_file_creates_parents(self, tmp_env, tmp_path):
         await tmp_env.write_file("sub/dir/file.txt", "nested")
         assert (tmp_path / "sub" / "dir" / "file.txt").read_text() == "nested"
@@ -41,6 +54,12 @@ class TestLocalExecutionEnvironment:
         await tmp_env.write_file("yes.txt", "hi")
         assert await tmp_env.file_exists("yes.txt")
 
+    async def test_remove_file(self, tmp_env, tmp_path):
+        await tmp_env.write_file("gone.txt", "hi")
+        await tmp_env.remove_file("gone.txt")
+        assert not (tmp_path / "gone.txt").exists()
+        await tmp_env.remove_file("gone.txt")  # missing file is fine
+
     async def test_list_directory(self, tmp_env, tmp_path):
         (tmp_path / "a.txt").write_text("a")
         (tmp_path / "subdir").mkdir()
@@ -61,6 +80,16 @@ class TestLocalExecutionEnvironment:
         assert "inner.txt" not in shallow_names
         assert "inner.txt" in deep_names
 
+    async def test_list_directory_depth_first_order(self, tmp_env, tmp_path):
+        (tmp_path / "b").mkdir()
+        (tmp_path / "b" / "inner.txt").write_text("xy")
+        (tmp_path / "a.txt").write_text("a")
+        (tmp_path / "c.txt").write_text("c")
+        entries = await tmp_env.list_directory(".", depth=2)
+        assert [e.name for e in entries] == ["a.txt", "b", "inner.txt", "c.txt"]
+        assert entries[2].size == 2
+        assert entries[1].size is None
+
     async def test_exec_command_basic(self, tmp_env):
         result = await tmp_env.exec_command("echo hello")
         assert result.stdout.strip() == "hello"
@@ -80,6 +109,15 @@ class TestLocalExecutionEnvironment:
         result = await tmp_env.exec_command("sleep 10", timeout_ms=200)
         assert result.timed_out
 
+    async def test_exec_command_cancel_kills_child(self, tmp_env, tmp_path):
+        task = asyncio.create_task(tmp_env.exec_command("sleep 0.5; touch marker"))
+        await asyncio.sleep(0.1)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        await asyncio.sleep(0.8)
+        assert not (tmp_path / "marker").exists()
+
     async def test_exec_command_working_dir(self, tmp_env, tmp_path):
         sub = tmp_path / "mydir"
         sub.mkdir()
@@ -97,6 +135,51 @@ class TestLocalExecutionEnvironment:
         output = await tmp_env.grep("foo", ".")
         assert "foo" in output
 
+    async def test_grep_uses_ripgrep_when_available(self, tmp_env, monkeypatch):
+        commands = []
+
+        async def fake_exec(argv, **kwargs):
+            commands.append(argv)
+            return ExecResult(stdout="a.py:1:foo\n")
+
+        monkeypatch.setattr(tmp_env, "_rg_path", "/usr/bin/rg")
+        monkeypatch.setattr(tmp_env, "exec_argv", fake_exec)
+        output = await tmp_env.grep(
+            "foo", ".", case_insensitive=True, glob_filter="*.py", max_results=5
+        )
+        assert output == "a.py:1:foo\n"
+        argv = commands[0]
+        assert argv[:3] == ["/usr/bin/rg", "-n", "--no-heading"]
+        assert "-i" in argv
+        assert argv[argv.index("--glob") + 1] == "*.py"
+        assert argv[argv.index("-m") + 1] == "5"
+        assert argv[-3:] == ["-e", "foo", tmp_env._resolve(".")]
+
+    async def test_grep_extended_syntax(self, tmp_env, tmp_path, monkeypatch):
+        monkeypatch.setattr(tmp_env, "_rg_path", None)
+        (tmp_path / "search.txt").write_text("foo\nbar\n(baz\n")
+        output = await tmp_env.grep("fo+|bar", ".")
+        assert "foo" in output
+        assert "bar" in output
+        assert "(baz" in await tmp_env.grep(r"\(baz", ".")
+
+    async def test_grep_reports_invalid_pattern(self, tmp_env, tmp_path):
+        (tmp_path / "search.txt").write_text("foo\n")
+        output = await tmp_env.grep("foo(", ".")
+        assert output.strip()
+
+    async def test_grep_pattern_and_path_with_spaces(self, tmp_env, tmp_path):
+        (tmp_path / "my dir").mkdir()
+        (tmp_path / "my dir" / "f.txt").write_text("hello world\nbye\n")
+        output = await tmp_env.grep("hello world", "my dir")
+        assert "hello world" in output
+
+    async def test_exec_argv_no_shell(self, tmp_env):
+        result = await tmp_env.exec_argv(["echo", "$HOME", "a  b"])
+        assert result.stdout == "$HOME a  b\n"
+        missing = await tmp_env.exec_argv(["definitely-not-a-real-binary"])
+        assert missing.exit_code == 127
+
     async def test_glob(self, tmp_env, tmp_path):
         (tmp_path / "a.py").write_text("")
         (tmp_path / "b.txt").write_text("")
@@ -105,6 +188,19 @@ class TestLocalExecutionEnvironment:
         assert len(matches) == 2
         assert all(m.endswith(".py") for m in matches)
 
+    async def test_glob_newest_first(self, tmp_env, tmp_path):
+        for name, mtime in [("old.py", 1000), ("new.py", 3000), ("mid.py", 2000)]:
+            f = tmp_path / name
+            f.write_text("")
+            os.utime(f, (mtime, mtime))
+        (tmp_path / "pkg").mkdir()
+        nested = tmp_path / "pkg" / "deep.py"
+        nested.write_text("")
+        os.utime(nested, (4000, 4000))
+        assert await tmp_env.glob("*.py") == ["new.py", "mid.py", "old.py"]
+        matches = await tmp_env.glob("**/*.py")
+        assert matches[0] == os.path.join("pkg", "deep.py")
+
     def test_working_directory(self, tmp_env, tmp_path):
         assert tmp_env.working_directory() == str(tmp_path)
 
@@ -142,6 +238,11 @@ class TestEnvFiltering:
         assert "MY_SECRET" not in env
         assert "AWS_CREDENTIAL" not in env
 
+    def test_secrets_excluded_case_insensitive(self, monkeypatch):
+        monkeypatch.setenv("github_token", "tok")
+        env = _filter_env()
+        assert "github_token" not in env
+
     def test_extra_vars_override(self, monkeypatch):
         monkeypatch.setenv("OPENAI_API_KEY", "sk-secret")
         env = _filter_env(extra={"CUSTOM": "val", "OPENAI_API_KEY": "override"})
@@ -149,6 +250,17 @@ class TestEnvFiltering:
         # Extra vars override the filtering
         assert env["OPENAI_API_KEY"] == "override"
 
+    async def test_env_cached_until_refresh(self, tmp_env, monkeypatch):
+        monkeypatch.setenv("ATTRACTOR_TEST_VAR", "one")
+        result = await tmp_env.exec_command("echo $ATTRACTOR_TEST_VAR")
+        assert result.stdout.strip() == "one"
+        monkeypatch.setenv("ATTRACTOR_TEST_VAR", "two")
+        result = await tmp_env.exec_command("echo $ATTRACTOR_TEST_VAR")
+        assert result.stdout.strip() == "one"
+        tmp_env.refresh_env()
+        result = await tmp_env.exec_command("echo $ATTRACTOR_TEST_VAR")
+        assert result.stdout.strip() == "two"
+
     def test_normal_vars_pass_through(self, monkeypatch):
         monkeypatch.setenv("MY_APP_CONFIG", "value123")
         env = _filter_env()
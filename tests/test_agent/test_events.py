@@ -1,6 +1,7 @@
 """Tests for event system."""
 
 import asyncio
+from collections import deque
 
 import pytest
 
@@ -62,6 +63,49 @@ class TestEventEmitter:
         assert not q1.empty()
         assert not q2.empty()
 
+    def test_has_listeners(self):
+        emitter = EventEmitter()
+        assert not emitter.has_listeners
+        q = emitter.subscribe()
+        assert emitter.has_listeners
+        emitter.unsubscribe(q)
+        assert not emitter.has_listeners
+        emitter.on_event(lambda e: None)
+        assert emitter.has_listeners
+
+    async def test_unsubscribe(self):
+        emitter = EventEmitter()
+        q1 = emitter.subscribe()
+        q2 = emitter.subscribe()
+        emitter.unsubscribe(q1)
+        await emitter.emit(SessionEvent(kind=EventKind.SESSION_END))
+        assert q1.empty()
+        assert not q2.empty()
+
+    async def test_full_bounded_subscriber_drops_events(self):
+        emitter = EventEmitter()
+        slow = emitter.subscribe(maxsize=1)
+        fast = emitter.subscribe()
+        await emitter.emit(SessionEvent(kind=EventKind.USER_INPUT))
+        await emitter.emit(SessionEvent(kind=EventKind.SESSION_END))
+        assert slow.qsize() == 1
+        assert fast.qsize() == 2
+
+    async def test_async_callback_error_doesnt_break(self):
+        emitter = EventEmitter()
+        received = []
+
+        async def failing(e):
+            raise RuntimeError("boom")
+
+        async def handler(e):
+            received.append(e)
+
+        emitter.on_event(failing)
+        emitter.on_event(handler)
+        await emitter.emit(SessionEvent(kind=EventKind.ERROR))
+        assert len(received) == 1
+
     async def test_callback_error_doesnt_break(self):
         emitter = EventEmitter()
         emitter.on_event(lambda e: 1 / 0)  # Will raise
@@ -96,6 +140,11 @@ class TestDetectLoop:
         sigs = ["a", "b", "a", "b", "a", "b", "a", "b", "a", "c"]
         assert not detect_loop(sigs, window_size=10)
 
+    def test_only_recent_window_considered(self):
+        sigs = ["x", "y", "z"] + ["a", "b"] * 5
+        assert detect_loop(sigs, window_size=10)
+        assert detect_loop(deque(sigs), window_size=10)
+
 
 class TestToolCallSignature:
     def test_same_call_same_sig(self):
@@ -108,6 +157,16 @@ class TestToolCallSignature:
         s2 = _tool_call_signature("read", {"path": "/b"})
         assert s1 != s2
 
+    def test_key_order_does_not_matter(self):
+        s1 = _tool_call_signature("grep", {"pattern": "x", "path": "."})
+        s2 = _tool_call_signature("grep", {"path": ".", "pattern": "x"})
+        assert s1 == s2
+
+    def test_value_types_are_distinguished(self):
+        assert _tool_call_signature("t", {"a": 1}) != _tool_call_signature("t", {"a": "1"})
+        assert _tool_call_signature("t", {"a": 1}) != _tool_call_signature("t", {"a": True})
+        assert _tool_call_signature("t", {"a": None}) != _tool_call_signature("t", {"a": "n"})
+
 
 class TestSteeringQueue:
     async def test_enqueue_drain(self):
@@ -128,6 +187,13 @@ class TestSteeringQueue:
         q.enqueue_sync("sync msg")
         assert not q.empty
 
+    async def test_enqueue_from_other_thread(self):
+        q = SteeringQueue()
+        await asyncio.to_thread(q.enqueue_sync, "from thread")
+        await q.enqueue("from loop")
+        assert await q.drain() == ["from thread", "from loop"]
+        assert q.empty
+
 
 class TestFollowUpQueue:
     async def test_enqueue_dequeue(self):
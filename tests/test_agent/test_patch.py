@@ -1,9 +1,14 @@
 """Tests for apply_patch v4a format."""
 
+import random
+
 import pytest
 
 from attractor_agent.environments.local import LocalExecutionEnvironment
-from attractor_agent.tools.patch import parse_patch, apply_hunk, apply_patch, Hunk
+from attractor_agent.tools.patch import (
+    parse_patch, apply_hunk, apply_patch, Hunk,
+    _find_window, _normalize,
+)
 
 
 @pytest.fixture
@@ -101,6 +106,20 @@ class TestParsePatch:
         assert ops[1].kind == "delete"
         assert ops[2].kind == "update"
 
+    def test_hunk_skips_blank_and_unprefixed_lines(self):
+        patch = """\
+*** Begin Patch
+*** Update File: a.py
+@@ x
+
+ context
+note
+-old
++new
+*** End Patch"""
+        ops = parse_patch(patch)
+        assert ops[0].hunks[0].lines == [(" ", "context"), ("-", "old"), ("+", "new")]
+
 
 class TestApplyHunk:
     def test_simple_replacement(self):
@@ -144,6 +163,69 @@ class TestApplyHunk:
         result = apply_hunk(file_lines, hunk)
         assert result == ["keep", "keep2"]
 
+    def test_fuzzy_match_ignores_whitespace_runs(self):
+        file_lines = ["a", "if  x:\t", "\treturn   1", "b"]
+        hunk = Hunk(
+            lines=[
+                (" ", "if x:"),
+                ("-", "    return 1"),
+                ("+", "    return 2"),
+            ],
+        )
+        result = apply_hunk(file_lines, hunk)
+        assert result == ["a", "if x:", "    return 2", "b"]
+
+    def test_trailing_whitespace_match_preferred_over_fuzzy(self):
+        file_lines = ["x  =  1", "y = 2", "x = 1   ", "y = 2"]
+        hunk = Hunk(lines=[(" ", "x = 1"), ("-", "y = 2"), ("+", "y = 3")])
+        result = apply_hunk(file_lines, hunk)
+        assert result == ["x  =  1", "y = 2", "x = 1", "y = 3"]
+
+    def test_input_not_mutated(self):
+        file_lines = ["keep", "remove"]
+        hunk = Hunk(lines=[(" ", "keep"), ("-", "remove")])
+        assert apply_hunk(file_lines, hunk) == ["keep"]
+        assert file_lines == ["keep", "remove"]
+
+    def test_compile_is_cached(self):
+        hunk = Hunk(context_hint=" x ", lines=[(" ", "a"), ("-", "b  c"), ("+", "d")])
+        compiled = hunk.compile()
+        assert hunk.compile() is compiled
+        assert compiled.existing == ["a", "b  c"]
+        assert compiled.rstripped_existing == ["a", "b  c"]
+        assert compiled.normalized_existing == ["a", "b c"]
+        assert compiled.output == ["a", "d"]
+        assert compiled.context_hint == "x"
+
+
+class TestFindWindow:
+    def test_first_match_wins(self):
+        lines = ["a", "b", "a", "b"]
+        assert _find_window(lines, ["a", "b"]) == 0
+        assert _find_window(lines, ["b", "a"]) == 1
+
+    def test_match_at_end(self):
+        assert _find_window(["x", "y", "z"], ["y", "z"]) == 1
+
+    def test_no_match(self):
+        assert _find_window(["x", "y"], ["y", "x"]) == -1
+        assert _find_window(["x"], ["x", "y"]) == -1
+
+    def test_agrees_with_naive_scan(self):
+        rng = random.Random(0)
+        lines = [rng.choice("abc") for _ in range(300)]
+        for _ in range(200):
+            n = rng.randint(1, 5)
+            target = [rng.choice("abc") for _ in range(n)]
+            expected = next(
+                (i for i in range(len(lines) - n + 1) if lines[i:i + n] == target),
+                -1,
+            )
+            assert _find_window(lines, target) == expected
+
+    def test_normalized_lines_are_interned(self):
+        assert _normalize("  }  ") is _normalize("}\t")
+
 
 class TestApplyPatchIntegration:
     async def test_add_file(self, env, tmp_path):
@@ -216,3 +298,37 @@ class TestApplyPatchIntegration:
         assert "Updated" in result
         content = (tmp_path / "fuzzy.py").read_text()
         assert "y = 3" in content
+
+    async def test_results_in_patch_order(self, env, tmp_path):
+        (tmp_path / "old.py").write_text("x")
+        patch = """\
+*** Begin Patch
+*** Add File: one.py
++1
+*** Delete File: old.py
+*** Add File: two.py
++2
+*** End Patch"""
+        result = await apply_patch(env, patch)
+        assert result.splitlines() == ["Added one.py", "Deleted old.py", "Added two.py"]
+        assert (tmp_path / "two.py").read_text() == "2\n"
+
+    async def test_failing_op_aborts_remaining(self, env, tmp_path):
+        (tmp_path / "b.txt").write_text("old\n")
+        patch = """\
+*** Begin Patch
+*** Add File: a.txt
++a
+*** Update File: missing.py
+@@
+-x
++y
+*** Update File: b.txt
+@@
+-old
++new
+*** End Patch"""
+        with pytest.raises(FileNotFoundError):
+            await apply_patch(env, patch)
+        assert (tmp_path / "a.txt").read_text() == "a\n"
+        assert (tmp_path / "b.txt").read_text() == "old\n"
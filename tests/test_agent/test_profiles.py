@@ -45,6 +45,42 @@ class TestOpenAIProfile:
         assert "test project" in prompt  # Layer 4: project docs
         assert "TypeScript" in prompt    # Layer 5: user instructions
 
+    def test_system_prompt_static_layers_first(self, env):
+        p = create_openai_profile(env=env)
+        prompt = p.build_system_prompt(
+            environment={"platform": "linux", "cwd": "/home/user"},
+            project_docs=["# Project\nThis is a test project."],
+            user_instructions="Always use TypeScript.",
+        )
+        order = [
+            prompt.index("apply_patch"),
+            prompt.index("Available Tools"),
+            prompt.index("test project"),
+            prompt.index("# Environment"),
+            prompt.index("TypeScript"),
+        ]
+        assert order == sorted(order)
+        assert prompt.index("- cwd:") < prompt.index("- platform:")
+
+    def test_system_prompt_memoized_until_tools_change(self, env):
+        p = create_openai_profile(env=env)
+        first = p.build_system_prompt(environment={"platform": "linux"})
+        assert p.build_system_prompt(environment={"platform": "linux"}) is first
+        assert p.build_system_prompt(environment={"platform": "darwin"}) != first
+        p.tool_registry.unregister("glob")
+        prompt = p.build_system_prompt(environment={"platform": "linux"})
+        assert "**glob**" in first
+        assert "**glob**" not in prompt
+
+    def test_tools_cached_until_registry_changes(self, env):
+        p = create_openai_profile(env=env)
+        first = p.tools()
+        assert p.tools() is first
+        p.tool_registry.unregister("glob")
+        tools = p.tools()
+        assert tools is not first
+        assert "glob" not in [t.name for t in tools]
+
     def test_provider_options_reasoning(self):
         p = OpenAIProfile(reasoning_effort="high")
         opts = p.provider_options()
@@ -130,6 +166,15 @@ class TestGeminiProfile:
         assert "aaa" in result
         assert "bbb" in result
 
+    async def test_read_many_files_keeps_order_and_errors(self, env, tmp_path):
+        (tmp_path / "a.txt").write_text("aaa")
+        (tmp_path / "c.txt").write_text("ccc")
+        p = create_gemini_profile(env=env)
+        tool = p.tool_registry.get("read_many_files")
+        result = await tool.executor(file_paths=["c.txt", "missing.txt", "a.txt"])
+        assert result.index("ccc") < result.index("missing.txt") < result.index("aaa")
+        assert "=== missing.txt ===\nError:" in result
+
     async def test_list_dir(self, env, tmp_path):
         (tmp_path / "file.txt").write_text("x")
         (tmp_path / "subdir").mkdir()
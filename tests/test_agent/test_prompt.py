@@ -95,6 +95,34 @@ class TestDiscoverProjectDocs:
         combined = "".join(docs)
         assert "truncated at 32KB" in combined
 
+    def test_truncation_respects_byte_budget(self, tmp_path):
+        (tmp_path / "AGENTS.md").write_text("é" * 20_000)  # 40,000 bytes
+        docs = discover_project_docs(str(tmp_path), "anthropic")
+        assert len(docs[0].encode()) <= MAX_PROJECT_DOCS_BYTES
+        assert set(docs[0]) == {"é"}
+        assert "truncated at 32KB" in docs[1]
+
+    def test_edited_file_is_reloaded(self, tmp_path):
+        doc = tmp_path / "AGENTS.md"
+        doc.write_text("first version")
+        assert "first version" in discover_project_docs(str(tmp_path), "anthropic")[0]
+        doc.write_text("second version, longer")
+        os.utime(doc, ns=(0, doc.stat().st_mtime_ns + 1_000_000))
+        assert "second version" in discover_project_docs(str(tmp_path), "anthropic")[0]
+
+    def test_returned_list_is_a_copy(self, tmp_path):
+        (tmp_path / "AGENTS.md").write_text("instructions")
+        docs = discover_project_docs(str(tmp_path), "anthropic")
+        docs.clear()
+        assert len(discover_project_docs(str(tmp_path), "anthropic")) == 1
+
+    def test_candidate_directory_is_skipped(self, tmp_path):
+        (tmp_path / "AGENTS.md").mkdir()
+        (tmp_path / "CLAUDE.md").write_text("Claude notes")
+        docs = discover_project_docs(str(tmp_path), "anthropic")
+        assert len(docs) == 1
+        assert "Claude notes" in docs[0]
+
     def test_no_files_returns_empty(self, tmp_path):
         docs = discover_project_docs(str(tmp_path), "anthropic")
         assert docs == []
@@ -29,6 +29,17 @@ class TestToolRegistry:
         assert reg.get("t") is None
         assert not reg.unregister("t")  # already removed
 
+    def test_version_bumps_on_change(self):
+        reg = ToolRegistry()
+        v0 = reg.version
+        reg.register(make_tool_def("t"), lambda: None)
+        v1 = reg.version
+        assert v1 > v0
+        assert not reg.unregister("missing")
+        assert reg.version == v1
+        reg.unregister("t")
+        assert reg.version > v1
+
     def test_definitions(self):
         reg = ToolRegistry()
         reg.register(make_tool_def("a"), lambda: None)
@@ -61,6 +72,9 @@ class TestToolRegistry:
         reg.register(make_tool_def("atool"), async_tool)
         result = await reg.execute("atool", {"x": "hello"})
         assert result.content == "got hello"
+        assert reg.get("atool").is_coro
+        reg.register(make_tool_def("stool"), lambda: "x")
+        assert not reg.get("stool").is_coro
 
     async def test_execute_unknown(self):
         reg = ToolRegistry()
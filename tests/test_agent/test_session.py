@@ -13,6 +13,9 @@ from attractor_agent.session import (
     SteeringTurn,
     ToolResultsTurn,
     UserTurn,
+    SystemTurn,
+    _convert_history_to_messages,
+    compact_history,
     process_input,
 )
 from attractor_agent.profiles.base import BaseProfile
@@ -38,8 +41,10 @@ class MockLLMClient:
     def __init__(self, responses: list[Response]):
         self._responses = list(responses)
         self._call_count = 0
+        self.requests = []
 
     async def complete(self, request):
+        self.requests.append(request)
         idx = min(self._call_count, len(self._responses) - 1)
         self._call_count += 1
         return self._responses[idx]
@@ -144,6 +149,97 @@ class TestProcessInput:
         assert "echoed: hi" in str(session.history[2].results[0].content)
         assert session.history[3].content == "Done!"
 
+    async def test_system_prompt_built_once_per_input(self):
+        profile = _make_profile_with_tool()
+        calls = 0
+        build = profile.build_system_prompt
+
+        def counting_build(*args, **kwargs):
+            nonlocal calls
+            calls += 1
+            return build(*args, **kwargs)
+
+        profile.build_system_prompt = counting_build
+        tool_call = ToolCall(id="tc1", name="echo", arguments={"message": "hi"})
+        client = MockLLMClient([
+            _tool_response([tool_call]),
+            _tool_response([tool_call]),
+            _text_response("Done!"),
+        ])
+        session = Session(profile=profile, llm_client=client)
+
+        await session.submit("Use echo")
+
+        assert calls == 1
+        assert len(client.requests) == 3
+        assert all(r.messages[0].role == Role.SYSTEM for r in client.requests)
+
+    async def test_system_message_reused_across_inputs(self):
+        profile = BaseProfile(id="test", model="test")
+        client = MockLLMClient([_text_response("one"), _text_response("two")])
+        session = Session(profile=profile, llm_client=client)
+
+        await session.submit("first")
+        await session.submit("second")
+
+        first, second = client.requests
+        assert first.messages[0] is second.messages[0]
+        assert first.messages is not second.messages
+
+    async def test_system_message_reused_for_rebuilt_equal_prompt(self):
+        class RebuildingProfile(BaseProfile):
+            def build_system_prompt(self, *args, **kwargs) -> str:
+                return "".join(["You are ", "helpful."])
+
+        profile = RebuildingProfile(id="test", model="test")
+        client = MockLLMClient([_text_response("one"), _text_response("two")])
+        session = Session(profile=profile, llm_client=client)
+
+        await session.submit("first")
+        await session.submit("second")
+
+        first, second = client.requests
+        assert first.messages[0] is second.messages[0]
+        assert first.messages[0].content[0].text == "You are helpful."
+
+    def test_turn_subclass_converts_like_its_base(self):
+        class TaggedUserTurn(UserTurn):
+            pass
+
+        messages = _convert_history_to_messages([TaggedUserTurn(content="hi")])
+        assert len(messages) == 1
+        assert messages[0].role == Role.USER
+
+    async def test_messages_converted_incrementally(self):
+        profile = _make_profile_with_tool()
+        tool_call = ToolCall(id="tc1", name="echo", arguments={"message": "hi"})
+        client = MockLLMClient([
+            _tool_response([tool_call]),
+            _text_response("Done!"),
+            _text_response("Again!"),
+        ])
+        session = Session(profile=profile, llm_client=client)
+
+        await session.submit("Use echo")
+        await session.submit("More")
+
+        expected = _convert_history_to_messages(session.history[:-1])
+        sent = client.requests[-1].messages[1:]
+        assert [m.role for m in sent] == [m.role for m in expected]
+        assert [m.text for m in sent] == [m.text for m in expected]
+        assert sent[2].tool_call_id == "tc1"
+
+    async def test_message_cache_rebuilt_after_history_shrinks(self):
+        profile = BaseProfile(id="test", model="test")
+        client = MockLLMClient([_text_response("one"), _text_response("two")])
+        session = Session(profile=profile, llm_client=client)
+
+        await session.submit("first")
+        session.history.clear()
+        await session.submit("second")
+
+        assert [m.text for m in client.requests[-1].messages[1:]] == ["second"]
+
     async def test_max_tool_rounds(self):
         profile = _make_profile_with_tool()
         tool_call = ToolCall(id="tc1", name="echo", arguments={"message": "loop"})
@@ -274,6 +370,166 @@ class TestEvents:
         assert len(end_events) == 1
         assert "echoed: hi" in str(end_events[0].data.get("output"))
 
+    async def test_tool_call_end_can_carry_truncated_output(self):
+        profile = BaseProfile(id="test", model="test")
+        profile.tool_registry.register(
+            ToolDefinition(name="big"), lambda: "z" * 100_000
+        )
+        tc = ToolCall(id="tc1", name="big", arguments={})
+        client = MockLLMClient([_tool_response([tc]), _text_response("done")])
+
+        for full in (True, False):
+            config = SessionConfig(emit_full_tool_output=full)
+            session = Session(profile=profile, llm_client=client, config=config)
+            events: list[SessionEvent] = []
+            session.event_emitter.on_event(lambda e: events.append(e))
+            client._call_count = 0
+
+            await session.submit("Go")
+
+            end = next(e for e in events if e.kind == EventKind.TOOL_CALL_END)
+            stored = session.history[2].results[0].content
+            assert len(stored) < 100_000
+            assert len(end.data["output"]) == (100_000 if full else len(stored))
+
+
+class TestCompactHistory:
+    def _long_history(self, rounds: int) -> list:
+        history = [UserTurn(content="Please fix the bug")]
+        for i in range(rounds):
+            tc = ToolCall(id=f"tc{i}", name="echo", arguments={"message": str(i)})
+            history.append(AssistantTurn(content=f"step {i}", tool_calls=[tc]))
+            history.append(ToolResultsTurn(
+                results=[ToolResult(tool_call_id=f"tc{i}", content="x" * 400)]
+            ))
+        return history
+
+    def test_under_budget_unchanged(self):
+        history = self._long_history(2)
+        assert compact_history(history, budget=10_000) is history
+
+    def test_folds_older_turns(self):
+        history = self._long_history(10)
+        compacted = compact_history(history, budget=500)
+        assert isinstance(compacted[0], SystemTurn)
+        assert "step 0" in compacted[0].content
+        assert len(compacted[0].content) < 600
+        # The current task follows the summary, then the last two rounds
+        # are kept verbatim, starting at an assistant turn
+        assert compacted[1] is history[0]
+        assert compacted[2:] == history[-4:]
+        assert isinstance(compacted[2], AssistantTurn)
+
+    def test_current_user_turn_kept_after_prior_history(self):
+        history = []
+        for i in range(5):
+            history.append(UserTurn(content=f"old question {i} " + "q" * 2000))
+            history.append(AssistantTurn(content=f"old answer {i} " + "a" * 2000))
+        current = UserTurn(content="CURRENT TASK: fix bug 123")
+        history.append(current)
+        for i in range(4):
+            tc = ToolCall(id=f"tc{i}", name="echo", arguments={"message": str(i)})
+            history.append(AssistantTurn(content=f"step {i}", tool_calls=[tc]))
+            history.append(ToolResultsTurn(
+                results=[ToolResult(tool_call_id=f"tc{i}", content="x" * 400)]
+            ))
+
+        compacted = compact_history(history, budget=2000)
+
+        assert isinstance(compacted[0], SystemTurn)
+        assert "CURRENT TASK" not in compacted[0].content
+        assert compacted[1] is current
+        assert compacted[2:] == history[-4:]
+
+    def test_user_turn_after_kept_rounds_not_duplicated(self):
+        history = self._long_history(10)
+        history.append(UserTurn(content="next task"))
+        compacted = compact_history(history, budget=500)
+        assert "Please fix the bug" in compacted[0].content
+        assert compacted[1:] == history[-5:]
+
+    async def test_session_compacts_when_over_budget(self):
+        profile = _make_profile_with_tool()
+        responses = [
+            _tool_response([ToolCall(id=f"tc{i}", name="echo", arguments={"message": "y" * 400})])
+            for i in range(6)
+        ] + [_text_response("done")]
+        client = MockLLMClient(responses)
+        config = SessionConfig(max_history_tokens=400, enable_loop_detection=False)
+        session = Session(profile=profile, llm_client=client, config=config)
+
+        await session.submit("Go")
+
+        assert isinstance(session.history[0], SystemTurn)
+        last = client.requests[-1].messages
+        assert last[1].text.startswith("[Summary of earlier conversation]")
+        assert last[2].role == Role.USER
+        assert last[2].text == "Go"
+        assert last[3].role == Role.ASSISTANT
+
+
+class TestParallelToolCalls:
+    async def test_concurrency_is_bounded(self, monkeypatch):
+        import attractor_agent.session as session_mod
+
+        monkeypatch.setattr(session_mod, "_MAX_PARALLEL_TOOL_CALLS", 2)
+        profile = BaseProfile(id="test", model="test")
+        running = 0
+        peak = 0
+
+        async def slow_tool(message: str) -> str:
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return message
+
+        profile.tool_registry.register(ToolDefinition(name="slow"), slow_tool)
+        calls = [
+            ToolCall(id=f"tc{i}", name="slow", arguments={"message": str(i)})
+            for i in range(6)
+        ]
+        client = MockLLMClient([_tool_response(calls), _text_response("done")])
+        session = Session(profile=profile, llm_client=client)
+
+        await session.submit("Go")
+
+        results = session.history[2].results
+        assert [r.tool_call_id for r in results] == [f"tc{i}" for i in range(6)]
+        assert [r.content for r in results] == [str(i) for i in range(6)]
+        assert peak == 2
+
+    async def test_emit_error_not_wrapped_and_siblings_finish(self, monkeypatch):
+        profile = BaseProfile(id="test", model="test")
+        finished = []
+
+        async def slow_tool(message: str) -> str:
+            await asyncio.sleep(0.01)
+            finished.append(message)
+            return message
+
+        profile.tool_registry.register(ToolDefinition(name="slow"), slow_tool)
+        calls = [
+            ToolCall(id=f"tc{i}", name="slow", arguments={"message": str(i)})
+            for i in range(3)
+        ]
+        client = MockLLMClient([_tool_response(calls), _text_response("done")])
+        session = Session(profile=profile, llm_client=client)
+        original_emit = session._emit
+
+        async def failing_emit(kind, **data):
+            if kind == EventKind.TOOL_CALL_START and data.get("call_id") == "tc0":
+                raise RuntimeError("listener failed")
+            await original_emit(kind, **data)
+
+        monkeypatch.setattr(session, "_emit", failing_emit)
+
+        with pytest.raises(RuntimeError, match="listener failed"):
+            await session.submit("Go")
+        await asyncio.sleep(0.05)
+        assert sorted(finished) == ["1", "2"]
+
 
 class TestLoopDetection:
     async def test_detects_repeating_pattern(self):
@@ -316,6 +572,19 @@ class TestLoopDetection:
         loop_events = [e for e in events if e.kind == EventKind.LOOP_DETECTION]
         assert len(loop_events) == 0
 
+    async def test_signature_buffer_is_bounded(self):
+        profile = _make_profile_with_tool()
+        responses = [
+            _tool_response([ToolCall(id=f"tc{i}", name="echo", arguments={"message": f"m{i}"})])
+            for i in range(80)
+        ] + [_text_response("done")]
+        client = MockLLMClient(responses)
+        session = Session(profile=profile, llm_client=client)
+
+        await session.submit("Go")
+
+        assert len(session._tool_signatures) == 64
+
 
 class TestSessionState:
     async def test_idle_after_completion(self):
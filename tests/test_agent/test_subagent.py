@@ -77,11 +77,12 @@ class TestSubAgentManager:
         agent_id = await mgr.spawn("task1")
         assert agent_id
 
-        # Simulate depth > 1 by setting parent_session on parent
-        parent._parent_session = Session(  # type: ignore
-            profile=BaseProfile(), llm_client=client
-        )
-        mgr2 = SubAgentManager(parent)
+        # The child is one level deep, so it may not spawn further
+        child = mgr.get(agent_id).session
+        assert child.depth == 1
+        child.config.max_subagent_depth = 1
+        mgr2 = SubAgentManager(child)
+        assert mgr2.current_depth == 1
         with pytest.raises(RuntimeError, match="depth"):
             await mgr2.spawn("task2")
 
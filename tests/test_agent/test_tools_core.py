@@ -12,6 +12,7 @@ from attractor_agent.tools.core import (
     make_glob_tool,
     register_core_tools,
 )
+from attractor_agent.tools.truncation import truncate_output
 
 
 @pytest.fixture
@@ -47,6 +48,53 @@ class TestReadFile:
         assert "c" in result
         assert "a\n" not in result.split("\t")[0]  # line 'a' not first
 
+    async def test_numbered_output_format(self, env, tmp_dir):
+        (tmp_dir / "test.txt").write_text("a\n\nb")
+        tool = make_read_file_tool(env)
+        result = await tool.execute(file_path="test.txt")
+        assert result == "     1\ta\n     2\t\n     3\tb"
+
+    async def test_trailing_newline_not_numbered(self, env, tmp_dir):
+        (tmp_dir / "test.txt").write_text("a\nb\n")
+        tool = make_read_file_tool(env)
+        result = await tool.execute(file_path="test.txt")
+        assert result == "     1\ta\n     2\tb\n"
+
+    async def test_long_file_keeps_numbered_head_and_tail(self, env, tmp_dir):
+        (tmp_dir / "big.txt").write_text("".join(f"row{i}\n" for i in range(1, 2001)))
+        tool = make_read_file_tool(env)
+        result = await tool.execute(file_path="big.txt")
+        assert result.startswith("     1\trow1\n")
+        assert "   250\trow250\n" in result
+        assert "row251\n" not in result
+        assert "[truncated 1500 lines]" in result
+        assert "  1751\trow1751\n" in result
+        assert result.endswith("  2000\trow2000\n")
+
+    async def test_long_wide_file_reports_chars_then_lines(self, env, tmp_dir):
+        (tmp_dir / "wide.txt").write_text(
+            "".join(f"row{i:04d} " + "x" * 96 + "\n" for i in range(1, 1001))
+        )
+        tool = make_read_file_tool(env)
+        result = await tool.execute(file_path="wide.txt")
+        content = (tmp_dir / "wide.txt").read_text()
+        numbered = "".join(
+            f"{i:6d}\t{line}\n" for i, line in enumerate(content.splitlines(), 1)
+        )
+        assert result == truncate_output(numbered, "read_file").text
+        assert f"[truncated {len(numbered) - 50_000} chars]" in result
+
+    async def test_negative_offset_numbered_from_first_line(self, env, tmp_dir):
+        (tmp_dir / "test.txt").write_text("a\nb\n")
+        tool = make_read_file_tool(env)
+        result = await tool.execute(file_path="test.txt", offset=-3)
+        assert result == "     1\ta\n     2\tb\n"
+
+    async def test_empty_file(self, env, tmp_dir):
+        (tmp_dir / "test.txt").write_text("")
+        tool = make_read_file_tool(env)
+        assert await tool.execute(file_path="test.txt") == ""
+
 
 class TestWriteFile:
     async def test_basic_write(self, env, tmp_dir):
@@ -101,6 +149,21 @@ class TestEditFile:
         assert "Replaced 3" in result
         assert (tmp_dir / "code.py").read_text() == "x = 2\nx = 2\nx = 2\n"
 
+    async def test_replace_all_not_found(self, env, tmp_dir):
+        (tmp_dir / "code.py").write_text("hello")
+        tool = make_edit_file_tool(env)
+        result = await tool.execute(
+            file_path="code.py", old_string="missing", new_string="x", replace_all=True
+        )
+        assert "not found" in result
+
+    async def test_empty_old_string_rejected(self, env, tmp_dir):
+        (tmp_dir / "code.py").write_text("hello")
+        tool = make_edit_file_tool(env)
+        result = await tool.execute(file_path="code.py", old_string="", new_string="x")
+        assert "Error" in result
+        assert (tmp_dir / "code.py").read_text() == "hello"
+
 
 class TestShell:
     async def test_basic_command(self, env):
@@ -162,3 +225,8 @@ class TestRegisterCoreTools:
         assert len(tools) == 6
         names = {t.name for t in tools}
         assert names == {"read_file", "write_file", "edit_file", "shell", "grep", "glob"}
+
+    def test_parameter_schemas_shared_between_instances(self, env):
+        first = {t.name: t.parameters for t in register_core_tools(env)}
+        second = {t.name: t.parameters for t in register_core_tools(env)}
+        assert all(first[name] is second[name] for name in first)
@@ -47,6 +47,15 @@ class TestTruncateLines:
         assert "line0" in result  # head preserved
         assert "line99" in result  # tail preserved
 
+    def test_keeps_exact_head_and_tail(self):
+        text = "".join(f"l{i}\n" for i in range(10))
+        result = truncate_lines(text, 4)
+        assert result == "l0\nl1\n\n... [truncated 6 lines] ...\nl8\nl9\n"
+
+    def test_unterminated_last_line(self):
+        result = truncate_lines("a\nb\nc\nd", 2)
+        assert result == "a\n\n... [truncated 2 lines] ...\nd"
+
     def test_single_line(self):
         assert truncate_lines("hello", 5) == "hello"
 
@@ -98,3 +107,10 @@ class TestTruncateOutput:
         text = ("x" * 1000 + "\n") * 300  # 300 lines, ~300K chars
         result = truncate_output(text, "grep")  # 20K chars, 200 lines
         assert result.was_truncated
+
+    def test_line_limit_uses_char_truncated_count(self):
+        text = "123456789\n" * 100  # 100 lines, 1000 chars
+        result = truncate_output(text, "shell", char_limit=200, line_limit=30)
+        assert result.original_lines == 100
+        assert "truncated" in result.text
+        assert "lines]" not in result.text
@@ -34,6 +34,13 @@ class TestListModels:
         assert all(m.provider == "openai" for m in openai)
         assert len(openai) >= 2
 
+    def test_returned_list_is_a_copy(self):
+        list_models(provider="anthropic").clear()
+        assert list_models(provider="anthropic")
+
+    def test_unknown_provider_empty(self):
+        assert list_models(provider="unknown") == []
+
 
 class TestGetLatestModel:
     def test_latest_anthropic(self):
@@ -58,3 +65,9 @@ class TestGetLatestModel:
         model = get_latest_model("anthropic", capability="reasoning")
         assert model is not None
         assert model.supports_reasoning is True
+
+    def test_capability_without_match(self):
+        assert get_latest_model("unknown", capability="vision") is None
+
+    def test_unknown_capability_ignored(self):
+        assert get_latest_model("openai", capability="teleport") is get_latest_model("openai")
@@ -2,9 +2,10 @@
 
 import os
 import pytest
+from dataclasses import dataclass
 from unittest.mock import AsyncMock, patch
 
-from attractor_llm.client import Client
+from attractor_llm.client import Client, get_default_client, set_default_client
 from attractor_llm.errors import ConfigurationError
 from attractor_llm.types import (
     FinishReason,
@@ -47,6 +48,14 @@ class TestClientConstruction:
         client = Client(providers={"openai": adapter}, default_provider="openai")
         assert client.default_provider == "openai"
 
+    def test_providers_is_read_only_view(self):
+        adapter = _make_mock_adapter("openai")
+        client = Client(providers={"openai": adapter})
+        assert client.providers is client.providers
+        assert client.providers["openai"] is adapter
+        with pytest.raises(TypeError):
+            client.providers["other"] = adapter
+
     def test_no_providers_raises(self):
         with pytest.raises(ConfigurationError):
             Client(providers={})
@@ -74,6 +83,25 @@ class TestClientFromEnv:
         client = Client.from_env()
         assert "gemini" in client.providers
 
+    @patch.dict(
+        os.environ,
+        {"GOOGLE_API_KEY": "g-key", "GEMINI_BASE_URL": "http://localhost:9000"},
+        clear=True,
+    )
+    def test_gemini_google_key_and_base_url(self):
+        client = Client.from_env()
+        assert list(client.providers) == ["gemini"]
+        assert client.providers["gemini"]._base_url == "http://localhost:9000"
+
+    def test_adapters_exported_lazily(self):
+        import attractor_llm
+        from attractor_llm.providers.openai import OpenAIAdapter
+
+        assert attractor_llm.OpenAIAdapter is OpenAIAdapter
+        assert "OpenAIAdapter" in vars(attractor_llm)
+        with pytest.raises(AttributeError):
+            attractor_llm.NoSuchAdapter
+
     @patch.dict(os.environ, {}, clear=True)
     def test_no_keys_raises(self):
         # Clear all API keys
@@ -134,6 +162,62 @@ class TestClientMiddleware:
         await client.complete(req)
         assert called == ["before", "after"]
 
+    @pytest.mark.asyncio
+    async def test_provider_handlers_reused_across_calls(self):
+        adapter = _make_mock_adapter("openai")
+
+        async def plain_stream(request):
+            yield StreamEvent(type=StreamEventType.FINISH)
+
+        adapter.stream = plain_stream
+        client = Client(providers={"openai": adapter})
+        client.use(lambda request, next_fn: next_fn(request))
+        client.use_stream(lambda request, next_fn: next_fn(request))
+
+        req = Request(model="gpt-5.2", messages=[Message.user("Hi")])
+        await client.complete(req)
+        await client.complete(req)
+        for _ in range(2):
+            events = [e async for e in await client.stream(req)]
+            assert events[-1].type == StreamEventType.FINISH
+
+        assert len(client._middleware._complete_chains) == 1
+        assert len(client._middleware._stream_chains) == 1
+
+    @pytest.mark.asyncio
+    async def test_stream_with_unhashable_adapter(self):
+        @dataclass
+        class DataclassAdapter:
+            name: str = "openai"
+
+            async def stream(self, request):
+                yield StreamEvent(type=StreamEventType.FINISH)
+
+        client = Client(providers={"openai": DataclassAdapter()})
+        req = Request(model="gpt-5.2", messages=[Message.user("Hi")])
+        for _ in range(2):
+            events = [e async for e in await client.stream(req)]
+            assert events[-1].type == StreamEventType.FINISH
+
+    @pytest.mark.asyncio
+    async def test_stream_handler_follows_replaced_adapter(self):
+        def adapter_yielding(text):
+            adapter = _make_mock_adapter("openai")
+
+            async def stream(request):
+                yield StreamEvent(type=StreamEventType.TEXT_DELTA, delta=text)
+
+            adapter.stream = stream
+            return adapter
+
+        providers = {"openai": adapter_yielding("old")}
+        client = Client(providers=providers)
+        req = Request(model="gpt-5.2", messages=[Message.user("Hi")])
+        assert [e.delta async for e in await client.stream(req)] == ["old"]
+
+        providers["openai"] = adapter_yielding("new")
+        assert [e.delta async for e in await client.stream(req)] == ["new"]
+
 
 class TestClientClose:
     @pytest.mark.asyncio
@@ -144,3 +228,24 @@ class TestClientClose:
         await client.close()
         a1.close.assert_called_once()
         a2.close.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_close_continues_past_failure(self):
+        a1 = _make_mock_adapter("openai")
+        a1.close = AsyncMock(side_effect=RuntimeError("boom"))
+        a2 = _make_mock_adapter("anthropic")
+        client = Client(providers={"openai": a1, "anthropic": a2})
+        with pytest.raises(RuntimeError):
+            await client.close()
+        a2.close.assert_awaited_once()
+
+
+class TestDefaultClient:
+    def test_set_default_client_replaces_cached(self):
+        first = Client(providers={"openai": _make_mock_adapter("openai")})
+        second = Client(providers={"openai": _make_mock_adapter("openai")})
+        set_default_client(first)
+        assert get_default_client() is first
+        assert get_default_client() is first
+        set_default_client(second)
+        assert get_default_client() is second
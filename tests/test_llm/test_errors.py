@@ -71,6 +71,11 @@ class TestRetryable:
         assert not InvalidToolCallError("test").retryable
         assert not NoObjectGeneratedError("test").retryable
 
+    def test_retryable_is_class_level(self):
+        assert NetworkError.retryable
+        assert not AuthenticationError.retryable
+        assert "retryable" not in vars(RateLimitError("x", provider="p"))
+
     def test_retryable(self):
         assert RateLimitError("test", provider="x").retryable
         assert ServerError("test", provider="x").retryable
@@ -101,6 +106,16 @@ class TestProviderErrorFields:
         err = SDKError("wrapped", cause=cause)
         assert err.cause is cause
 
+    def test_subclass_status_codes(self):
+        assert AuthenticationError("x", provider="p").status_code == 401
+        assert RateLimitError("x", provider="p", retry_after=2.0).status_code == 429
+        assert ServerError("x", provider="p").status_code is None
+        assert ServerError("x", provider="p", status_code=502).status_code == 502
+
+    def test_explicit_retryable_overrides_class(self):
+        assert not ServerError("x", provider="p", retryable=False).retryable
+        assert ProviderError("x", provider="p").retryable
+
 
 class TestClassifyErrorMessage:
     def test_not_found(self):
@@ -119,5 +134,17 @@ class TestClassifyErrorMessage:
         assert classify_error_message("content filter triggered") == "content_filter"
         assert classify_error_message("blocked by safety system") == "content_filter"
 
+    def test_case_insensitive(self):
+        assert classify_error_message("Model Not Found") == "not_found"
+
+    def test_earlier_category_wins(self):
+        msg = "context length exceeded: model not found"
+        assert classify_error_message(msg) == "not_found"
+
     def test_unknown(self):
         assert classify_error_message("something random") is None
+
+    def test_non_ascii_case_variants_not_matched(self):
+        assert classify_error_message("\u017fafety violation") is None
+        assert classify_error_message("unauthor\u0131zed") is None
+        assert classify_error_message("\u0130nvalid key") is None
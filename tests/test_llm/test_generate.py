@@ -1,10 +1,12 @@
 """Tests for attractor_llm.generate."""
 
+import asyncio
+
 import pytest
 from unittest.mock import AsyncMock
 
 from attractor_llm.client import Client
-from attractor_llm.generate import generate, GenerateResult, StepResult
+from attractor_llm.generate import generate, GenerateResult, StepResult, _start_tools
 from attractor_llm.errors import ConfigurationError
 from attractor_llm.types import (
     ContentKind,
@@ -205,3 +207,129 @@ class TestGenerate:
         call_args = adapter.complete.call_args[0][0]
         assert call_args.messages[0].role == Role.SYSTEM
         assert call_args.messages[0].text == "Be helpful."
+
+    @pytest.mark.asyncio
+    async def test_conversation_grows_across_rounds(self):
+        tool = ToolDefinition(
+            name="echo",
+            description="Echo",
+            parameters={"type": "object", "properties": {}},
+            execute=lambda: "ok",
+        )
+        responses = iter([
+            _tool_response([{"id": "call_1", "name": "echo", "args": {}}]),
+            _text_response("done"),
+        ])
+        seen: list[int] = []
+
+        async def complete(request):
+            seen.append(len(request.messages))
+            return next(responses)
+
+        adapter = AsyncMock()
+        adapter.complete = complete
+        client = Client(providers={"test": adapter}, default_provider="test")
+        caller_messages = [Message.user("Hi")]
+
+        await generate(
+            model="test", messages=caller_messages, tools=[tool],
+            max_tool_rounds=1, client=client,
+        )
+
+        assert seen == [1, 3]  # user; user + assistant + tool result
+        assert len(caller_messages) == 1
+
+    @pytest.mark.asyncio
+    async def test_earlier_requests_not_mutated(self):
+        tool = ToolDefinition(
+            name="echo",
+            description="Echo",
+            parameters={"type": "object", "properties": {}},
+            execute=lambda: "ok",
+        )
+        responses = iter([
+            _tool_response([{"id": "call_1", "name": "echo", "args": {}}]),
+            _text_response("done"),
+        ])
+        requests = []
+
+        async def complete(request):
+            requests.append(request)
+            return next(responses)
+
+        adapter = AsyncMock()
+        adapter.complete = complete
+        client = Client(providers={"test": adapter}, default_provider="test")
+
+        await generate(model="test", prompt="Hi", tools=[tool], max_tool_rounds=1, client=client)
+
+        assert requests[0] is not requests[1]
+        assert len(requests[0].messages) == 1
+        assert len(requests[1].messages) == 3
+
+    @pytest.mark.asyncio
+    async def test_tool_results_batched_into_one_message(self):
+        tool = ToolDefinition(
+            name="echo",
+            description="Echo",
+            parameters={"type": "object", "properties": {}},
+            execute=lambda: "ok",
+        )
+        responses = iter([
+            _tool_response([
+                {"id": "call_1", "name": "echo", "args": {}},
+                {"id": "call_2", "name": "echo", "args": {}},
+            ]),
+            _text_response("done"),
+        ])
+        requests = []
+
+        async def complete(request):
+            requests.append(request.messages)
+            return next(responses)
+
+        adapter = AsyncMock()
+        adapter.complete = complete
+        client = Client(providers={"test": adapter}, default_provider="test")
+
+        await generate(
+            model="test", prompt="Hi", tools=[tool],
+            max_tool_rounds=1, client=client,
+        )
+
+        tool_msg = requests[1][-1]
+        assert len(requests[1]) == 3
+        assert tool_msg.role == Role.TOOL
+        assert [p.tool_result.tool_call_id for p in tool_msg.content] == ["call_1", "call_2"]
+
+
+class TestStartTools:
+    @pytest.mark.asyncio
+    async def test_sync_handlers_finish_before_return(self):
+        calls = [ToolCall(id="1", name="a", arguments={}), ToolCall(id="2", name="b", arguments={})]
+        tasks = _start_tools(calls, {"a": (lambda: "A", False), "b": (lambda: "B", False)})
+        assert all(t.done() for t in tasks)
+        results = [t.result() for t in tasks]
+        assert [(r.tool_call_id, r.content) for r in results] == [("1", "A"), ("2", "B")]
+
+    @pytest.mark.asyncio
+    async def test_unknown_tool(self):
+        tasks = _start_tools([ToolCall(id="1", name="nope", arguments={})], {})
+        (result,) = await asyncio.gather(*tasks)
+        assert result.is_error
+
+    @pytest.mark.asyncio
+    async def test_async_handler(self):
+        async def fetch(x: int) -> str:
+            await asyncio.sleep(0)
+            return f"got {x}"
+
+        tasks = _start_tools([ToolCall(id="1", name="f", arguments={"x": 2})], {"f": (fetch, True)})
+        (result,) = await asyncio.gather(*tasks)
+        assert result.content == "got 2"
+
+
+class TestResultTypes:
+    def test_results_are_slotted(self):
+        assert not hasattr(StepResult(), "__dict__")
+        assert not hasattr(GenerateResult(), "__dict__")
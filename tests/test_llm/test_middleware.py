@@ -33,6 +33,7 @@ class TestMiddlewareChain:
 
         result = await chain.apply_complete(req, handler)
         assert result.text == "Hello"
+        assert chain._complete_chains == {}
 
     @pytest.mark.asyncio
     async def test_request_modification(self):
@@ -142,3 +143,67 @@ class TestMiddlewareChain:
 
         assert len(events) == 3
         assert collected_deltas == ["Hello", " world"]
+
+    @pytest.mark.asyncio
+    async def test_chain_reused_until_middleware_added(self):
+        calls = []
+
+        async def mw1(request, next_fn):
+            calls.append("mw1")
+            return await next_fn(request)
+
+        async def mw2(request, next_fn):
+            calls.append("mw2")
+            return await next_fn(request)
+
+        async def handler(r: Request) -> Response:
+            return Response(
+                id="1", model="test", provider="test",
+                message=Message.assistant("ok"),
+                finish_reason=FinishReason(reason="stop"),
+                usage=Usage(input_tokens=1, output_tokens=1, total_tokens=2),
+            )
+
+        chain = MiddlewareChain()
+        chain.use(mw1)
+        await chain.apply_complete(Request(model="test"), handler)
+        cached = chain._complete_chains[handler]
+        await chain.apply_complete(Request(model="test"), handler)
+        assert chain._complete_chains[handler] is cached
+
+        chain.use(mw2)
+        await chain.apply_complete(Request(model="test"), handler)
+        assert calls == ["mw1", "mw1", "mw1", "mw2"]
+
+    @pytest.mark.asyncio
+    async def test_next_fn_can_be_called_twice(self):
+        """A retrying middleware may invoke the rest of the chain again."""
+        calls = []
+
+        async def retry_once(request, next_fn):
+            try:
+                return await next_fn(request)
+            except RuntimeError:
+                return await next_fn(request)
+
+        async def count(request, next_fn):
+            calls.append("count")
+            return await next_fn(request)
+
+        chain = MiddlewareChain()
+        chain.use(retry_once)
+        chain.use(count)
+
+        async def handler(r: Request) -> Response:
+            if len(calls) == 1:
+                raise RuntimeError("transient")
+            return Response(
+                id="1", model="test", provider="test",
+                message=Message.assistant("ok"),
+                finish_reason=FinishReason(reason="stop"),
+                usage=Usage(input_tokens=1, output_tokens=1, total_tokens=2),
+            )
+
+        result = await chain.apply_complete(Request(model="test", messages=[]), handler)
+        assert result.text == "ok"
+        assert calls == ["count", "count"]
@@ -5,10 +5,11 @@ import pytest
 import httpx
 from pytest_httpx import HTTPXMock
 
-from attractor_llm.providers.anthropic import AnthropicAdapter
+from attractor_llm.providers.anthropic import AnthropicAdapter, _iter_sse_data
 from attractor_llm.types import (
     ContentKind,
     ContentPart,
+    ImageData,
     Message,
     Request,
     Role,
@@ -127,6 +128,21 @@ class TestAnthropicComplete:
         assert resp.usage.cache_write_tokens == 10
 
 
+class TestAnthropicRateLimit:
+    def test_parses_headers(self, adapter: AnthropicAdapter):
+        info = adapter._parse_rate_limit(httpx.Headers({
+            "anthropic-ratelimit-requests-remaining": "49",
+            "anthropic-ratelimit-tokens-limit": "80000",
+        }))
+        assert info.requests_remaining == 49
+        assert info.requests_limit is None
+        assert info.tokens_remaining is None
+        assert info.tokens_limit == 80000
+
+    def test_absent_headers(self, adapter: AnthropicAdapter):
+        assert adapter._parse_rate_limit(httpx.Headers({"x-other": "1"})) is None
+
+
 class TestAnthropicMessageTranslation:
     @pytest.mark.asyncio
     async def test_system_extraction(self, httpx_mock: HTTPXMock, adapter: AnthropicAdapter):
@@ -199,6 +215,108 @@ class TestAnthropicMessageTranslation:
         assert tool_msg["content"][0]["type"] == "tool_result"
         assert tool_msg["content"][0]["tool_use_id"] == "toolu_1"
 
+    def test_mixed_part_kinds(self, adapter: AnthropicAdapter):
+        _, messages = adapter._translate_messages([
+            Message(
+                role=Role.USER,
+                content=[
+                    ContentPart(kind=ContentKind.TEXT, text="look"),
+                    ContentPart(kind=ContentKind.IMAGE, image=ImageData(url="https://x/a.png")),
+                    ContentPart(kind=ContentKind.IMAGE, image=ImageData(data=b"png")),
+                ],
+            ),
+            Message(
+                role=Role.ASSISTANT,
+                content=[
+                    ContentPart(
+                        kind=ContentKind.THINKING,
+                        thinking=ThinkingData(text="hmm", signature="sig"),
+                    ),
+                    ContentPart(
+                        kind=ContentKind.REDACTED_THINKING,
+                        thinking=ThinkingData(text="opaque", redacted=True),
+                    ),
+                    ContentPart(kind=ContentKind.TEXT, text="ok"),
+                ],
+            ),
+        ])
+        assert messages[0]["content"] == [
+            {"type": "text", "text": "look"},
+            {"type": "image", "source": {"type": "url", "url": "https://x/a.png"}},
+            {"type": "image", "source": {"type": "base64", "media_type": "image/png", "data": "cG5n"}},
+        ]
+        assert messages[1]["content"] == [
+            {"type": "thinking", "thinking": "hmm", "signature": "sig"},
+            {"type": "redacted_thinking", "data": "opaque"},
+            {"type": "text", "text": "ok"},
+        ]
+
+    def test_tool_results_merge_with_user_turns(self, adapter: AnthropicAdapter):
+        _, messages = adapter._translate_messages([
+            Message.user("a"),
+            Message.assistant("b"),
+            Message.tool_result(tool_call_id="t1", content="r1"),
+            Message.tool_result(tool_call_id="t2", content="r2"),
+            Message.user("c"),
+            Message(role=Role.ASSISTANT, content=[]),
+            Message.assistant("d"),
+        ])
+        assert [m["role"] for m in messages] == ["user", "assistant", "user", "assistant"]
+        assert [b.get("tool_use_id", b.get("text")) for b in messages[2]["content"]] == ["t1", "t2", "c"]
+
+    def test_image_encoding_reused(self, adapter: AnthropicAdapter):
+        image = ContentPart(kind=ContentKind.IMAGE, image=ImageData(data=b"\x89PNG"))
+        blocks = [
+            adapter._translate_messages([Message(role=Role.USER, content=[image])])[1][0]["content"][0]
+            for _ in range(3)
+        ]
+        assert blocks[0]["source"]["data"] == "iVBORw=="
+        assert all(b["source"]["data"] is blocks[0]["source"]["data"] for b in blocks)
+        assert list(adapter._image_cache) == [b"\x89PNG"]
+
+    def test_image_cache_bounded_by_bytes(self, adapter: AnthropicAdapter, monkeypatch):
+        import attractor_llm.providers.anthropic as anthropic_mod
+
+        monkeypatch.setattr(anthropic_mod, "_MAX_CACHED_IMAGE_BYTES", 8)
+        for data in (b"aaaa", b"bbbb", b"cccc", b"x" * 9):
+            adapter._encode_image(data)
+        assert list(adapter._image_cache) == [b"cccc"]
+        assert adapter._image_cache_bytes == 4
+        assert AnthropicAdapter(api_key="other")._image_cache == {}
+
+    def test_bytearray_image_not_cached(self, adapter: AnthropicAdapter):
+        image = ContentPart(kind=ContentKind.IMAGE, image=ImageData(data=bytearray(b"png")))
+        _, messages = adapter._translate_messages([Message(role=Role.USER, content=[image])])
+        assert messages[0]["content"][0]["source"]["data"] == "cG5n"
+
+    @pytest.mark.asyncio
+    async def test_json_tool_arguments_and_results(self, httpx_mock: HTTPXMock, adapter: AnthropicAdapter):
+        httpx_mock.add_response(
+            url="https://api.anthropic.com/v1/messages",
+            json=_make_response(),
+        )
+        await adapter.complete(
+            Request(
+                model="claude-opus-4-6",
+                messages=[
+                    Message.user("weather?"),
+                    Message(
+                        role=Role.ASSISTANT,
+                        content=[ContentPart(
+                            kind=ContentKind.TOOL_CALL,
+                            tool_call=ToolCallData(
+                                id="toolu_1", name="weather", arguments='{"city": "SF"}',
+                            ),
+                        )],
+                    ),
+                    Message.tool_result(tool_call_id="toolu_1", content={"temp": 72}),
+                ],
+            )
+        )
+        body = json.loads(httpx_mock.get_requests()[0].content)
+        assert body["messages"][1]["content"][0]["input"] == {"city": "SF"}
+        assert json.loads(body["messages"][2]["content"][0]["content"]) == {"temp": 72}
+
     @pytest.mark.asyncio
     async def test_max_tokens_default(self, httpx_mock: HTTPXMock, adapter: AnthropicAdapter):
         httpx_mock.add_response(
@@ -288,6 +406,28 @@ class TestAnthropicToolChoice:
         assert body["tool_choice"] == {"type": "tool", "name": "get_weather"}
 
 
+class TestAnthropicToolTranslation:
+    def test_supports_tool_choice(self, adapter: AnthropicAdapter):
+        for mode in ("auto", "none", "required", "named"):
+            assert adapter.supports_tool_choice(mode)
+        assert not adapter.supports_tool_choice("parallel")
+
+    def test_unknown_tool_choice_falls_back_to_auto(self, adapter: AnthropicAdapter):
+        assert adapter._translate_tool_choice(ToolChoice(mode="bogus")) == {"type": "auto"}
+
+    def test_translated_tool_reused(self, adapter: AnthropicAdapter):
+        tool = ToolDefinition(name="t", description="d", parameters={"type": "object"})
+        first = adapter._translate_tool(tool)
+        assert adapter._translate_tool(tool) is first
+        assert first == {"name": "t", "description": "d", "input_schema": {"type": "object"}}
+
+    def test_edited_tool_retranslated(self, adapter: AnthropicAdapter):
+        tool = ToolDefinition(name="t", description="d", parameters={"type": "object"})
+        adapter._translate_tool(tool)
+        tool.description = "changed"
+        assert adapter._translate_tool(tool)["description"] == "changed"
+
+
 class TestAnthropicBetaHeaders:
     @pytest.mark.asyncio
     async def test_beta_headers(self, httpx_mock: HTTPXMock, adapter: AnthropicAdapter):
@@ -309,6 +449,58 @@ class TestAnthropicBetaHeaders:
         sent = httpx_mock.get_requests()[0]
         assert "interleaved-thinking-2025-05-14,prompt-caching-2024-07-31" in sent.headers.get("anthropic-beta", "")
 
+    @pytest.mark.asyncio
+    async def test_beta_headers_survive_resend(self, httpx_mock: HTTPXMock, adapter: AnthropicAdapter):
+        for _ in range(2):
+            httpx_mock.add_response(
+                url="https://api.anthropic.com/v1/messages",
+                json=_make_response(),
+            )
+        request = Request(
+            model="claude-opus-4-6",
+            messages=[Message.user("Hi")],
+            provider_options={"anthropic": {"beta_headers": ["b1"], "metadata": {"user_id": "u"}}},
+        )
+        await adapter.complete(request)
+        await adapter.complete(request)
+        for sent in httpx_mock.get_requests():
+            assert sent.headers.get("anthropic-beta") == "b1"
+            body = json.loads(sent.content)
+            assert "beta_headers" not in body
+            assert body["metadata"] == {"user_id": "u"}
+
+    @pytest.mark.asyncio
+    async def test_no_per_request_headers_by_default(self, adapter: AnthropicAdapter):
+        _, headers = adapter._build_request(
+            Request(model="claude-opus-4-6", messages=[Message.user("Hi")]), stream=False
+        )
+        assert headers is None
+
+
+class TestAnthropicRequestEncoding:
+    @pytest.mark.asyncio
+    async def test_body_sent_as_json(self, httpx_mock: HTTPXMock, adapter: AnthropicAdapter):
+        httpx_mock.add_response(
+            url="https://api.anthropic.com/v1/messages",
+            json=_make_response(),
+        )
+        await adapter.complete(Request(model="claude-opus-4-6", messages=[Message.user("héllo")]))
+        sent = httpx_mock.get_requests()[0]
+        assert sent.headers["content-type"] == "application/json"
+        assert json.loads(sent.content)["messages"][0]["content"][0]["text"] == "héllo"
+
+    @pytest.mark.asyncio
+    async def test_custom_client_gets_content_type(self, httpx_mock: HTTPXMock):
+        httpx_mock.add_response(
+            url="https://api.anthropic.com/v1/messages",
+            json=_make_response(),
+        )
+        adapter = AnthropicAdapter(api_key="test-key", http_client=httpx.AsyncClient())
+        await adapter.complete(Request(model="claude-opus-4-6", messages=[Message.user("Hi")]))
+        sent = httpx_mock.get_requests()[0]
+        assert sent.headers["content-type"] == "application/json"
+        await adapter.close()
+
 
 class TestAnthropicErrors:
     @pytest.mark.asyncio
@@ -381,3 +573,50 @@ class TestAnthropicStreaming:
         deltas = [e.delta for e in events if e.type == StreamEventType.TEXT_DELTA]
         assert "Hello" in deltas
         assert " world" in deltas
+
+    @pytest.mark.asyncio
+    async def test_tool_use_stream_finish_reason(self, httpx_mock: HTTPXMock, adapter: AnthropicAdapter):
+        sse_lines = "\n".join([
+            'data: {"type":"message_start","message":{"usage":{"input_tokens":3}}}',
+            ': keep-alive',
+            'event: ping',
+            'data: {"type":"ping"}',
+            'data: {"type":"content_block_start","index":0,"content_block":{"type":"tool_use","id":"toolu_1","name":"weather"}}',
+            'data: {"type":"content_block_delta","index":0,"delta":{"type":"input_json_delta","partial_json":"{\\"city\\":"}}',
+            'data: {"type":"content_block_delta","index":0,"delta":{"type":"input_json_delta","partial_json":"\\"SF\\"}"}}',
+            'data: {"type":"content_block_stop","index":0}',
+            'data: {"type":"message_delta","delta":{"stop_reason":"tool_use"},"usage":{"output_tokens":7}}',
+            'data: {"type":"message_stop"}',
+            '',
+        ])
+        httpx_mock.add_response(
+            url="https://api.anthropic.com/v1/messages",
+            stream=httpx.ByteStream(sse_lines.encode()),
+        )
+        events = [
+            e async for e in adapter.stream(
+                Request(model="claude-opus-4-6", messages=[Message.user("Hi")])
+            )
+        ]
+
+        end = next(e for e in events if e.type == StreamEventType.TOOL_CALL_END)
+        assert end.tool_call.arguments == {"city": "SF"}
+        finish = events[-1]
+        assert finish.type == StreamEventType.FINISH
+        assert finish.finish_reason.reason == "tool_calls"
+        assert finish.usage.total_tokens == 10
+
+    @pytest.mark.asyncio
+    async def test_sse_lines_split_across_chunks(self):
+        body = b'event: ping\r\ndata: {"a": 1}\r\n\r\n: c\ndata: {"b": "\xc3\xa9"}\ndata: {"c": 3}'
+        chunks = [body[i:i + 5] for i in range(0, len(body), 5)]
+        resp = httpx.Response(200, stream=httpx.ByteStream(b""))
+        resp.aiter_bytes = lambda: _aiter(chunks)
+
+        payloads = [json.loads(p) async for p in _iter_sse_data(resp)]
+        assert payloads == [{"a": 1}, {"b": "é"}, {"c": 3}]
+
+
+async def _aiter(items):
+    for item in items:
+        yield item
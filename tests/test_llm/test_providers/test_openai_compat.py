@@ -16,6 +16,7 @@ from attractor_llm.types import (
     ToolCallData,
     ToolChoice,
     ToolDefinition,
+    ToolResult,
 )
 from attractor_llm.errors import ServerError
 
@@ -124,6 +125,30 @@ class TestOpenAICompatMessageTranslation:
         assert tool_msg["tool_call_id"] == "call_1"
         assert tool_msg["content"] == "72F"
 
+    @pytest.mark.asyncio
+    async def test_batched_tool_results_fan_out(self, httpx_mock: HTTPXMock, adapter: OpenAICompatibleAdapter):
+        httpx_mock.add_response(
+            url="https://api.example.com/v1/chat/completions",
+            json=_make_response(),
+        )
+        await adapter.complete(
+            Request(
+                model="llama-3",
+                messages=[
+                    Message.user("hi"),
+                    Message.tool_results([
+                        ToolResult(tool_call_id="call_1", content="72F"),
+                        ToolResult(tool_call_id="call_2", content={"t": 18}),
+                    ]),
+                ],
+            )
+        )
+        body = json.loads(httpx_mock.get_requests()[0].content)
+        assert body["messages"][1:] == [
+            {"role": "tool", "tool_call_id": "call_1", "content": "72F"},
+            {"role": "tool", "tool_call_id": "call_2", "content": '{"t": 18}'},
+        ]
+
 
 class TestOpenAICompatStreaming:
     @pytest.mark.asyncio
@@ -74,6 +74,16 @@ class TestMessage:
         assert msg.content[0].tool_result.content == "result"
         assert msg.content[0].tool_result.is_error is False
 
+    def test_tool_results_constructor(self):
+        msg = Message.tool_results([
+            ToolResult(tool_call_id="call_1", content="a"),
+            ToolResult(tool_call_id="call_2", content="b", is_error=True),
+        ])
+        assert msg.role == Role.TOOL
+        assert [p.tool_result.tool_call_id for p in msg.content] == ["call_1", "call_2"]
+        assert msg.content[1].tool_result.is_error is True
+        assert msg.tool_call_id is None
+
     def test_text_accessor(self):
         msg = Message(
             role=Role.ASSISTANT,
@@ -95,6 +105,10 @@ class TestMessage:
 
 
 class TestContentPart:
+    def test_response_part_types_are_slotted(self):
+        for obj in (ContentPart(), ThinkingData(), ToolCallData(), FinishReason(), Usage()):
+            assert not hasattr(obj, "__dict__")
+
     def test_text_part(self):
         p = ContentPart(kind=ContentKind.TEXT, text="hello")
         assert p.kind == ContentKind.TEXT
@@ -203,6 +217,17 @@ class TestResponse:
 
 
 class TestUsage:
+    def test_inplace_addition(self):
+        total = Usage()
+        ident = id(total)
+        total += Usage(input_tokens=10, output_tokens=5, total_tokens=15, reasoning_tokens=3)
+        total += Usage(input_tokens=1, output_tokens=1, total_tokens=2, cache_read_tokens=7)
+        assert id(total) == ident
+        assert total == Usage(
+            input_tokens=11, output_tokens=6, total_tokens=17,
+            reasoning_tokens=3, cache_read_tokens=7,
+        )
+
     def test_addition(self):
         a = Usage(input_tokens=10, output_tokens=5, total_tokens=15)
         b = Usage(input_tokens=20, output_tokens=10, total_tokens=30)